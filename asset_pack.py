@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+from PyQt5 import sip
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+PACK_MAGIC = b"HMIPACK1"
+PACK_VERSION = 1
+HEADER = struct.Struct("<8sII")  # Magic, version, length of the JSON index that follows
+ALIGNMENT = 64  # Every image starts on a 64 byte boundary of the file (and so of the mapping)
+PACK_FORMAT = QImage.Format_ARGB32_Premultiplied  # Native raster format: no conversion when drawn
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def asset_key(file, scale):
+    return f"{file}@{scale:g}"
+
+
+def load_image(path, scale=1.0, transform=Qt.FastTransformation):
+    """Decode and scale an image exactly like PixmapCache does on a miss, converted to PACK_FORMAT"""
+    image = QImage(path)
+    if image.isNull():
+        return image
+    if scale != 1.0:
+        image = image.scaled(int(image.width() * scale), int(image.height() * scale),
+                             Qt.KeepAspectRatio, transform)
+    return image.convertToFormat(PACK_FORMAT)
+
+
+def build_pack(path, image_dir, assets):
+    """Write each (file, scale, transform) asset, decoded and pre-scaled, into one pack file.
+    Returns the index that was written."""
+    index = {}
+    blobs = []
+    offset = 0
+    for file, scale, transform in assets:
+        key = asset_key(file, scale)
+        if key in index:
+            continue
+        source = os.path.join(image_dir, file)
+        image = load_image(source, scale, transform)
+        if image.isNull():
+            print(f"Skipping unreadable image: {source}")
+            continue
+        stat = os.stat(source)
+        index[key] = {
+            "offset": offset,
+            "width": image.width(),
+            "height": image.height(),
+            "bytes_per_line": image.bytesPerLine(),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns
+        }
+        data = image.constBits().asstring(image.sizeInBytes())
+        blobs.append(data)
+        offset = align(offset + len(data))
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+    data_start = align(HEADER.size + len(index_bytes))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(b"\0" * (align(f.tell()) - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+    return index
+
+
+class AssetPack:
+    """Memory-mapped pack file; image() returns QImages over the mapped pixels instead of copies"""
+    def __init__(self, path, image_dir=None):
+        self.path = path
+        self.image_dir = image_dir  # When set, entries older than their source PNG are ignored
+        with open(path, "rb") as f:
+            # Copy-on-write mapping: writable for QImage, yet the pages stay shared with other processes
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_len = HEADER.unpack_from(self.map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"Not a version {PACK_VERSION} asset pack: {path}")
+        self.index = json.loads(self.map[HEADER.size:HEADER.size + index_len].decode("utf-8"))
+        self.address = int(sip.voidptr(self.map)) + align(HEADER.size + index_len)
+
+    def is_stale(self, file, entry):
+        try:
+            stat = os.stat(os.path.join(self.image_dir, file))
+        except OSError:
+            return False  # Source gone: the packed copy is all there is
+        return stat.st_size != entry["source_size"] or stat.st_mtime_ns != entry["source_mtime_ns"]
+
+    def image(self, file, scale=1.0):
+        """QImage of a packed asset, or None if it is not in the pack (or out of date). Only valid while
+        this pack is alive; QPixmap.fromImage() takes its own copy."""
+        entry = self.index.get(asset_key(file, scale))
+        if entry is None or (self.image_dir and self.is_stale(file, entry)):
+            return None
+        return QImage(sip.voidptr(self.address + entry["offset"]), entry["width"], entry["height"],
+                      entry["bytes_per_line"], PACK_FORMAT)
+
+
+def main():
+    from workshop3_1 import IMAGE_DIR, ASSET_PACK_PATH, required_assets
+    parser = argparse.ArgumentParser(description="Pack every image used by DECK_GRAPHICS/TELL_TALES, pre-scaled")
+    parser.add_argument("--output", default=ASSET_PACK_PATH, help="Pack file to write")
+    args = parser.parse_args()
+    index = build_pack(args.output, IMAGE_DIR, required_assets())
+    print(f"Packed {len(index)} images into {args.output} ({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
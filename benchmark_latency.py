@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QRect
+from PyQt5.QtWidgets import QApplication
+from metrics import percentiles
+
+TIMEOUT_S = 2.0  # A change not visible by then is reported as a timeout, not a sample
+
+
+class FrameProbe:
+    """Grabs what the window has actually painted (its backing store) and waits for a change to show up"""
+    def __init__(self, app, window):
+        self.app = app
+        self.window = window
+        self.screen = app.primaryScreen()
+        self.grab_ms = []
+
+    def grab(self):
+        start = time.perf_counter()
+        frame = self.screen.grabWindow(int(self.window.winId())).toImage()
+        self.grab_ms.append((time.perf_counter() - start) * 1000)
+        return frame
+
+    def settle(self, seconds=0.05):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.app.processEvents()
+        return self.grab()
+
+    def wait(self, start, visible):
+        """Spin the event loop until visible(frame) holds; returns ms since start, or None on timeout"""
+        while time.perf_counter() - start < TIMEOUT_S:
+            self.app.processEvents()
+            if visible(self.grab()):
+                return (time.perf_counter() - start) * 1000
+        return None
+
+
+def changed_from(before, rect=None):
+    if rect is None:
+        return lambda frame: frame != before
+    region = before.copy(rect)
+    return lambda frame: frame.copy(rect) != region
+
+
+def matches(reference, rect):
+    return lambda frame: frame.copy(rect) == reference
+
+
+def element_rect(w, element_id):
+    deck_num, card_num, elem = w.COMPILED_CONFIG.element_ids[element_id]
+    return QRect(elem.x, elem.y, max(elem.w, 1), max(elem.h, 1)) if elem.w else None
+
+
+def telltale_rect(w, deck_num, card_num):
+    record = w.COMPILED_CONFIG.card(deck_num, card_num).telltale
+    pixmap = w.PIXMAP_CACHE.get(record.file, w.TELLTALE_SCALE, w.Qt.SmoothTransformation)
+    return QRect(record.x, record.y, pixmap.width(), pixmap.height())
+
+
+def contended_zone(w):
+    """Three non-blinking telltales from different decks sharing the busiest zone"""
+    zones = defaultdict(dict)
+    for deck_num, cards in w.COMPILED_CONFIG.decks.items():
+        if not w.COMPILED_CONFIG.is_telltale_deck(deck_num):
+            continue
+        for card in cards:
+            if card.telltale is not None and not card.telltale.blinking:
+                zones[card.telltale.zone].setdefault(deck_num, card.card_num)
+    zone = max(zones, key=lambda z: len(zones[z]))
+    telltales = sorted(zones[zone].items())
+    return zone, telltales[:3] if len(telltales) >= 3 else None
+
+
+def run_scenarios(w, queue, probe, iterations):
+    """Returns {operation: [latency ms]} and {operation: timeouts}"""
+    results = defaultdict(list)
+    timeouts = defaultdict(int)
+
+    def measure(operation, action, visible_after=None):
+        before = probe.settle()
+        start = time.perf_counter()
+        action()
+        latency = probe.wait(start, visible_after(before) if visible_after else changed_from(before))
+        if latency is None:
+            timeouts[operation] += 1
+        else:
+            results[operation].append(latency)
+
+    def activate_all(cards, status):
+        for deck_num, card_num in cards:
+            queue.send_activation(deck_num, card_num, status)
+
+    deck_cards = [(d, 1) for d, cards in w.DECK_GRAPHICS.items() if 1 in cards]
+    telltale_cards = [(d, c) for d, cards in w.TELL_TALES.items() for c in cards if c > 0]
+
+    # Single card: show and hide the speed readout
+    for i in range(iterations):
+        measure("single_card.activate", lambda: queue.send_activation(13, 1, True))
+        measure("single_card.deactivate", lambda: queue.send_activation(13, 1, False))
+
+    # All decks at once, timed until the first changed pixel reaches the frame
+    for i in range(iterations):
+        measure("all_decks.activate", lambda: activate_all(deck_cards, True))
+        measure("all_decks.deactivate", lambda: activate_all(deck_cards, False))
+
+    for i in range(iterations):
+        measure("all_telltales.activate", lambda: activate_all(telltale_cards, True))
+        measure("all_telltales.deactivate", lambda: activate_all(telltale_cards, False))
+
+    # Zone contention: a telltale joining a zone two others already share is only visible on its round-robin turn
+    zone, telltales = contended_zone(w)
+    if telltales:
+        target = telltales[2]
+        rect = telltale_rect(w, *target)
+        queue.send_activation(*target, True)
+        reference = probe.settle(0.2).copy(rect)
+        queue.send_activation(*target, False)
+        activate_all(telltales[:2], True)
+        for i in range(iterations):
+            measure(f"zone_contention.activate(zone {zone})",
+                    lambda: queue.send_activation(*target, True), lambda before: matches(reference, rect))
+            queue.send_activation(*target, False)
+        activate_all(telltales[:2], False)
+
+    # Dynamic text and progress bar updates on already visible cards
+    activate_all([(13, 1), (14, 1)], True)
+    speed_deck, speed_card, _ = w.COMPILED_CONFIG.element_ids["speed"]
+    bar_deck, bar_card, bar = w.COMPILED_CONFIG.element_ids["range_bar"]
+    bar_rect = element_rect(w, "range_bar")
+    for i in range(iterations):
+        # Two-character values: the widget renderer's QLabel keeps its initial width and clips longer text
+        measure("send_dynamic_text", lambda i=i: queue.send_dynamic_text(speed_deck, speed_card, ("40", "90")[i % 2]))
+        value = bar.minimum + (bar.maximum - bar.minimum) * (1 + i % 2) // 3
+        measure("send_progress_bar", lambda v=value: queue.send_progress_bar(bar_deck, bar_card, v),
+                lambda before: changed_from(before, bar_rect))
+    activate_all([(13, 1), (14, 1)], False)
+    return results, timeouts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Activation-to-pixel latency of MessageQueue operations")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured changes per operation")
+    parser.add_argument("--renderer", choices=("widgets", "scene"), default="widgets")
+    parser.add_argument("--lazy", action="store_true", help="Build cards on first activation")
+    parser.add_argument("--output", default="benchmark_latency.json", help="Where to save the results")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    import workshop3_1 as w
+    main_window = w.MainWindow(lazy=args.lazy, renderer=args.renderer)
+    queue = w.MessageQueue(main_window)
+    main_window.show()
+    probe = FrameProbe(app, main_window)
+    probe.settle(0.2)
+
+    results, timeouts = run_scenarios(w, queue, probe, args.iterations)
+    summary = {
+        "renderer": args.renderer,
+        "lazy": args.lazy,
+        "iterations": args.iterations,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "grab_ms": percentiles(probe.grab_ms),  # Included in every latency sample, and bounds its resolution
+        "operations": {op: dict(percentiles(values), timeouts=timeouts[op]) for op, values in results.items()}
+    }
+    for op in timeouts:
+        summary["operations"].setdefault(op, {"count": 0, "timeouts": timeouts[op]})
+
+    print(f"{'operation':40s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s}  (ms)")
+    for op, stats in summary["operations"].items():
+        if stats["count"]:
+            print(f"{op:40s} {stats['p50']:8.2f} {stats['p95']:8.2f} {stats['p99']:8.2f} {stats['max']:8.2f}"
+                  + (f"  {stats['timeouts']} timeouts" if stats["timeouts"] else ""))
+        else:
+            print(f"{op:40s} no change observed ({stats['timeouts']} timeouts)")
+    print(f"grab cost p50 {summary['grab_ms']['p50']:.2f} ms (included in the latencies above)")
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Results saved to {args.output}")
+    main_window.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
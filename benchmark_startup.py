@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from metrics import percentiles
+
+PHASES = ("qt_import", "import", "decks", "telltale_decks", "image_decode", "first_paint", "chime_preload", "total")
+
+
+def measure_startup(renderer, lazy):
+    """One cold start in this process: returns milliseconds per phase"""
+    phases = {}
+    start = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    phases["qt_import"] = (time.perf_counter() - start) * 1000
+
+    mark = time.perf_counter()
+    import workshop3_1  # Includes compile_config and mapping the asset pack
+    phases["import"] = (time.perf_counter() - mark) * 1000
+
+    main_window = workshop3_1.MainWindow(lazy=lazy, renderer=renderer)
+    phases.update(main_window.startup_ms)
+
+    # First frame of a fully populated cluster: card 1 of every regular deck
+    mark = time.perf_counter()
+    queue = workshop3_1.MessageQueue(main_window)
+    for deck_num, cards in workshop3_1.DECK_GRAPHICS.items():
+        if 1 in cards:
+            queue.send_activation(deck_num, 1, True)
+    main_window.show()
+    app.processEvents()
+    phases["first_paint"] = (time.perf_counter() - mark) * 1000
+    phases["image_decode"] = workshop3_1.PIXMAP_CACHE.stats()["load_ms"]
+
+    mark = time.perf_counter()
+    workshop3_1.CHIME_BANK.preload()  # Starts the decoders; decoding itself continues asynchronously
+    phases["chime_preload"] = (time.perf_counter() - mark) * 1000
+    phases["total"] = (time.perf_counter() - start) * 1000
+    main_window.close()
+    return phases
+
+
+def run_child(args):
+    """Run one cold start in a fresh interpreter so imports and caches are cold every time"""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--renderer", args.renderer]
+    if args.lazy:
+        command.append("--lazy")
+    result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=120,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(summary, baseline, max_regression):
+    """Print p50 changes against a previous result file; returns the phases that regressed too much"""
+    regressed = []
+    for phase, stats in summary["phases"].items():
+        old = baseline.get("phases", {}).get(phase)
+        if not old or not old.get("p50"):
+            continue
+        change = stats["p50"] / old["p50"] - 1
+        print(f"  {phase:15s} p50 {old['p50']:8.2f} -> {stats['p50']:8.2f} ms ({change:+.0%})")
+        if change > max_regression and stats["p50"] - old["p50"] > 1.0:  # Ignore sub-millisecond noise
+            regressed.append(phase)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of workshop3_1.MainWindow")
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts to measure, one process each")
+    parser.add_argument("--renderer", choices=("widgets", "scene"), default="widgets")
+    parser.add_argument("--lazy", action="store_true", help="Build cards on first activation")
+    parser.add_argument("--output", default="benchmark_startup.json", help="Where to save the results")
+    parser.add_argument("--baseline", help="Previous results to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Fail if a phase p50 grows by more than this fraction of the baseline")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_startup(args.renderer, args.lazy)))
+        return 0
+
+    samples = []
+    for run in range(args.runs):
+        samples.append(run_child(args))
+        print(f"run {run + 1}/{args.runs}: total {samples[-1]['total']:.1f} ms")
+    summary = {
+        "renderer": args.renderer,
+        "lazy": args.lazy,
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "phases": {phase: percentiles([s[phase] for s in samples if phase in s]) for phase in PHASES},
+        "samples": samples
+    }
+    print(f"{'phase':15s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>8s}  (ms)")
+    for phase, stats in summary["phases"].items():
+        if stats["count"]:
+            print(f"{phase:15s} {stats['p50']:8.2f} {stats['p90']:8.2f} {stats['p99']:8.2f} {stats['max']:8.2f}")
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(summary, json.load(f), args.max_regression)
+        if regressed:
+            print(f"Startup regression in: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import os
+import time
+import logging
+from collections import deque
+import numpy as np
+from PyQt5.QtCore import QObject, QIODevice
+from PyQt5.QtMultimedia import QAudio, QAudioDecoder, QAudioFormat, QAudioOutput
+from event_trace import TRACE, CHIME_START, CHIME_STOP, CHIME_FIRST_SAMPLE
+from metrics import percentiles
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_BYTES = 2  # Signed 16-bit little endian
+FRAME_BYTES = CHANNELS * SAMPLE_BYTES
+OUTPUT_BUFFER_MS = 20  # Small device buffer keeps trigger-to-sound latency low
+BLOCK_FRAMES = 512  # Frames mixed per readData call, preallocated once
+MAX_VOICES = 4  # Voices mixed at the same time
+DEFAULT_PRIORITY = 1
+DUCK_GAIN = 0.3  # Gain applied to voices below the highest active priority
+REPEAT_GAP_MS = 300  # Silence between the plays of a repeated ("twice") chime
+LATENCY_WINDOW = 500  # Number of recent trigger-to-first-sample measurements kept
+
+
+def pcm_format():
+    """The single PCM format every chime is decoded to and mixed in"""
+    fmt = QAudioFormat()
+    fmt.setSampleRate(SAMPLE_RATE)
+    fmt.setChannelCount(CHANNELS)
+    fmt.setSampleSize(SAMPLE_BYTES * 8)
+    fmt.setCodec("audio/pcm")
+    fmt.setByteOrder(QAudioFormat.LittleEndian)
+    fmt.setSampleType(QAudioFormat.SignedInt)
+    return fmt
+
+
+class ChimeVoice:
+    """One triggered chime inside the mixer"""
+    __slots__ = ("name", "samples", "pos", "priority", "chime_type", "repeats", "gap", "trigger_time", "started")
+
+    def __init__(self, name, samples, priority, chime_type, repeats):
+        self.name = name
+        self.samples = samples  # (frames, CHANNELS) int16, None until decoded
+        self.pos = 0  # Frame position; negative while inside a repeat gap
+        self.priority = priority
+        self.chime_type = chime_type
+        self.repeats = repeats
+        self.gap = SAMPLE_RATE * REPEAT_GAP_MS // 1000
+        self.trigger_time = time.perf_counter()
+        self.started = False
+
+    def preempt_key(self):
+        """Lowest sorts first: lowest priority, then continuous chimes (they re-trigger anyway), then oldest"""
+        return (self.priority, self.chime_type != "continuous", self.trigger_time)
+
+
+class ChimeMixer(QIODevice):
+    """Pull-mode device summing all active voices into one PCM stream for a single QAudioOutput"""
+    def __init__(self, bank):
+        super().__init__()
+        self.bank = bank
+        self.mix_buffer = np.zeros((BLOCK_FRAMES, CHANNELS), dtype=np.float32)
+        self.scratch = np.zeros((BLOCK_FRAMES, CHANNELS), dtype=np.float32)
+        self.out_buffer = np.zeros((BLOCK_FRAMES, CHANNELS), dtype=np.int16)
+        self.blocks = 0
+        self.open(QIODevice.ReadOnly)
+
+    def readData(self, maxlen):
+        voices = [v for v in self.bank.voices if v.samples is not None]
+        frames = min(BLOCK_FRAMES, maxlen // FRAME_BYTES)
+        if not voices or frames <= 0:
+            return b""  # Nothing to play: the output goes idle until the next play()
+        mix = self.mix_buffer[:frames]
+        mix.fill(0)
+        top_priority = max(v.priority for v in voices)
+        for voice in voices:
+            if not voice.started:
+                voice.started = True
+                self.bank.on_first_sample(voice)
+            gain = 1.0 if voice.priority >= top_priority else DUCK_GAIN
+            self.mix_voice(voice, mix, frames, gain)
+        np.clip(mix, -32768, 32767, out=mix)
+        out = self.out_buffer[:frames]
+        out[:] = mix
+        self.blocks += 1
+        return out.tobytes()
+
+    def mix_voice(self, voice, mix, frames, gain):
+        offset = 0
+        while offset < frames:
+            if voice.pos < 0:  # Silence between repeats
+                skip = min(-voice.pos, frames - offset)
+                voice.pos += skip
+                offset += skip
+                continue
+            chunk = voice.samples[voice.pos:voice.pos + frames - offset]
+            count = len(chunk)
+            if count:
+                scratch = self.scratch[:count]
+                np.multiply(chunk, gain, out=scratch)
+                mix[offset:offset + count] += scratch
+                voice.pos += count
+                offset += count
+            if voice.pos >= len(voice.samples):
+                voice.repeats -= 1
+                if voice.repeats <= 0:
+                    self.bank.finish(voice)
+                    return
+                voice.pos = -voice.gap
+
+    def writeData(self, data):
+        return -1
+
+    def bytesAvailable(self):
+        return BLOCK_FRAMES * FRAME_BYTES + super().bytesAvailable()
+
+
+class ChimeBank(QObject):
+    """Decodes each chime to PCM once and mixes the active ones into a single shared output"""
+    def __init__(self, chime_files, chimes_dir, priorities=None, max_voices=MAX_VOICES, parent=None):
+        super().__init__(parent)
+        self.chime_files = chime_files
+        self.chime_ids = {name: i for i, name in enumerate(chime_files)}  # Chime code in the event trace
+        TRACE.names["chime"] = list(chime_files)
+        self.chimes_dir = chimes_dir
+        self.priorities = priorities or {}
+        self.max_voices = max_voices
+        self.format = pcm_format()
+        self.pcm = {}  # name: (frames, CHANNELS) int16 array
+        self.decoders = {}  # name: (QAudioDecoder, [chunks]) while decoding
+        self.failed = set()
+        self.voices = []  # Active ChimeVoice, including ones waiting for their decode
+        self.mixer = None
+        self.output = None  # Created on first play, once a QApplication exists
+        self.preempted = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # (name, trigger-to-first-sample ms)
+
+    def path(self, name):
+        return os.path.join(self.chimes_dir, self.chime_files.get(name, ""))
+
+    def has(self, name):
+        return name in self.chime_files and os.path.exists(self.path(name))
+
+    def preload(self):
+        """Start decoding every configured chime"""
+        for name in self.chime_files:
+            self.load(name)
+
+    def load(self, name):
+        if name in self.pcm or name in self.decoders or name in self.failed:
+            return
+        if not self.has(name):
+            logger.error(f"Chime file not found: {self.path(name)}")
+            self.failed.add(name)
+            return
+        decoder = QAudioDecoder(self)
+        decoder.setAudioFormat(self.format)
+        decoder.setSourceFilename(self.path(name))
+        decoder.bufferReady.connect(lambda n=name: self.on_buffer_ready(n))
+        decoder.finished.connect(lambda n=name: self.on_decoded(n))
+        decoder.error.connect(lambda error, n=name: self.on_decode_error(n, error))
+        self.decoders[name] = (decoder, [])
+        decoder.start()
+
+    def on_buffer_ready(self, name):
+        if name not in self.decoders:
+            return
+        decoder, chunks = self.decoders[name]
+        buffer = decoder.read()
+        if not buffer.isValid():
+            return
+        if buffer.format() != self.format:
+            self.on_decode_error(name, "decoder did not convert to the bank PCM format")
+            return
+        chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def on_decoded(self, name):
+        if name not in self.decoders:
+            return
+        decoder, chunks = self.decoders.pop(name)
+        decoder.deleteLater()
+        samples = np.frombuffer(b"".join(chunks), dtype="<i2").reshape(-1, CHANNELS)
+        self.pcm[name] = samples
+        logger.info(f"Chime decoded - {name}: {len(samples)} frames PCM")
+        waiting = [v for v in self.voices if v.name == name and v.samples is None]
+        for voice in waiting:
+            voice.samples = samples
+        if waiting:
+            self.ensure_output()
+
+    def on_decode_error(self, name, error):
+        logger.error(f"Chime decode error - {name}: {error}")
+        if name in self.decoders:
+            decoder, _ = self.decoders.pop(name)
+            decoder.stop()
+            decoder.deleteLater()
+        self.voices = [v for v in self.voices if v.name != name]
+        self.failed.add(name)
+
+    def play(self, name, chime_type="once", repeats=1):
+        """Mix a new voice of the chime and return it for stop(); None if unavailable or outranked"""
+        if name in self.failed or name not in self.chime_files:
+            return None
+        voice = ChimeVoice(name, self.pcm.get(name), self.priorities.get(name, DEFAULT_PRIORITY),
+                           chime_type, repeats)
+        if len(self.voices) >= self.max_voices:
+            victim = min(self.voices, key=ChimeVoice.preempt_key)
+            if victim.priority > voice.priority:
+                self.rejected += 1
+                logger.info(f"Chime rejected - {name}: {self.max_voices} voices of higher priority active")
+                return None
+            self.voices.remove(victim)
+            TRACE.emit(CHIME_STOP, self.chime_ids[victim.name], 0, len(self.voices))
+            self.preempted += 1
+            logger.info(f"Chime preempted - {victim.name} by {name}")
+        self.voices.append(voice)
+        TRACE.emit(CHIME_START, self.chime_ids[name], voice.priority, len(self.voices))
+        if voice.samples is None:
+            self.load(name)
+        else:
+            self.ensure_output()
+        return voice
+
+    def ensure_output(self):
+        """Start (or restart after going idle) the single output pulling from the mixer"""
+        if self.output is None:
+            self.mixer = ChimeMixer(self)
+            self.output = QAudioOutput(self.format, self)
+            self.output.setBufferSize(SAMPLE_RATE * FRAME_BYTES * OUTPUT_BUFFER_MS // 1000)
+        if self.output.state() != QAudio.ActiveState:
+            self.output.start(self.mixer)
+
+    def finish(self, voice):
+        if voice in self.voices:
+            self.voices.remove(voice)
+            TRACE.emit(CHIME_STOP, self.chime_ids[voice.name], 0, len(self.voices))
+
+    def stop(self, voice):
+        """Stop a voice returned by play(); a voice already finished or preempted is ignored"""
+        if voice is not None:
+            self.finish(voice)
+
+    def stop_all(self):
+        for voice in list(self.voices):
+            self.finish(voice)
+
+    def on_first_sample(self, voice):
+        latency_ms = (time.perf_counter() - voice.trigger_time) * 1000
+        self.latencies.append((voice.name, latency_ms))
+        TRACE.emit(CHIME_FIRST_SAMPLE, self.chime_ids[voice.name], 0, int(latency_ms * 1000))
+        logger.debug(f"Chime first sample - {voice.name}: {latency_ms:.2f} ms after trigger")
+
+    def latency_stats(self):
+        """Trigger-to-first-sample latency (ms) over the last LATENCY_WINDOW voices"""
+        return percentiles([latency for _, latency in self.latencies])
+
+    def mixer_stats(self):
+        return {
+            "active_voices": len(self.voices),
+            "max_voices": self.max_voices,
+            "preempted": self.preempted,
+            "rejected": self.rejected,
+            "blocks_mixed": self.mixer.blocks if self.mixer else 0
+        }
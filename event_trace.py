@@ -0,0 +1,145 @@
+import sys
+import json
+import time
+import struct
+import argparse
+import itertools
+import threading
+
+TRACE_MAGIC = b"HMIEVTS1"
+TRACE_VERSION = 2
+HEADER = struct.Struct("<8sII")  # Magic, version, length of the JSON metadata that follows; then the events
+EVENT = struct.Struct("<QqIHiii")  # Sequence (0: empty slot), monotonic ns, native thread id, event, a, b, value
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+TRACE_CAPACITY = 65536  # Events kept; about 2.2 MB, preallocated
+
+# Event codes, and what their a/b/value fields hold
+CARD_ACTIVATE = 1
+CARD_DEACTIVATE = 2
+TELLTALE_ACTIVATE = 3
+TELLTALE_DEACTIVATE = 4
+ZONE_UPDATE = 5
+ZONE_CYCLE = 6
+BLINK_TOGGLE = 7
+CHIME_START = 8
+CHIME_STOP = 9
+CHIME_FIRST_SAMPLE = 10
+REST_ARRIVAL = 11
+REST_DEQUEUE = 12
+FRAME_COMMIT = 13
+EVENT_FIELDS = {
+    CARD_ACTIVATE: ("card_activate", ("deck", "card", None)),
+    CARD_DEACTIVATE: ("card_deactivate", ("deck", "card", None)),
+    TELLTALE_ACTIVATE: ("telltale_activate", ("deck", "card", None)),
+    TELLTALE_DEACTIVATE: ("telltale_deactivate", ("deck", "card", None)),
+    ZONE_UPDATE: ("zone_update", ("zone", "telltales", None)),
+    ZONE_CYCLE: ("zone_cycle", ("zone", "deck", "card")),
+    BLINK_TOGGLE: ("blink_toggle", ("labels", None, "visible")),
+    CHIME_START: ("chime_start", ("chime", "priority", "voices")),
+    CHIME_STOP: ("chime_stop", ("chime", None, "voices")),
+    CHIME_FIRST_SAMPLE: ("chime_first_sample", ("chime", None, "latency_us")),
+    REST_ARRIVAL: ("rest_arrival", ("deck", "card", "queue_depth")),
+    REST_DEQUEUE: ("rest_dequeue", ("deck", "card", "lag_us")),
+    FRAME_COMMIT: ("frame_commit", ("activations", None, None)),
+}
+
+
+def fit_int32(value):
+    return value if isinstance(value, int) and INT32_MIN <= value <= INT32_MAX else -1
+
+
+class EventTrace:
+    """Fixed-size ring of packed events. emit() claims a slot without a lock (next() on an
+    itertools.count is atomic under the GIL), so the Qt, server and audio threads can all record."""
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * EVENT.size)
+        self.sequence = itertools.count(1)
+        self.names = {"chime": []}  # Tables for codes stored in a/b, e.g. chime index -> chime name
+
+    def emit(self, event, a=0, b=0, value=0):
+        """Never raises: a, b or value that do not fit an int32 (e.g. a client's deck_num) are recorded as -1"""
+        seq = next(self.sequence)
+        offset = (seq % self.capacity) * EVENT.size
+        try:
+            EVENT.pack_into(self.buffer, offset, seq, time.monotonic_ns(), threading.get_native_id(), event, a, b, value)
+        except struct.error:
+            EVENT.pack_into(self.buffer, offset, seq, time.monotonic_ns(), threading.get_native_id(), event,
+                            fit_int32(a), fit_int32(b), fit_int32(value))
+
+    def snapshot(self):
+        """Events currently held, oldest first, as (seq, t_ns, tid, event, a, b, value) tuples"""
+        data = bytes(self.buffer)  # One copy under the GIL; writers keep going meanwhile
+        events = [e for e in EVENT.iter_unpack(data) if e[0]]
+        events.sort()
+        return events
+
+    def metadata(self):
+        threads = {t.native_id: t.name for t in threading.enumerate() if t.native_id is not None}
+        return {
+            "capacity": self.capacity,
+            "clock": "monotonic_ns",
+            "names": self.names,
+            "threads": {str(tid): name for tid, name in threads.items()}
+        }
+
+    def dump(self, path):
+        """Write the held events to a binary dump; returns how many"""
+        events = self.snapshot()
+        meta = json.dumps(self.metadata()).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, len(meta)))
+            f.write(meta)
+            for event in events:
+                f.write(EVENT.pack(*event))
+        return len(events)
+
+    def chrome_trace(self):
+        return to_chrome_trace(self.snapshot(), self.metadata())
+
+
+def load_dump(path):
+    """(events, metadata) from a file written by EventTrace.dump"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, meta_len = HEADER.unpack_from(data, 0)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"Not a version {TRACE_VERSION} event dump: {path}")
+    meta = json.loads(data[HEADER.size:HEADER.size + meta_len].decode("utf-8"))
+    return list(EVENT.iter_unpack(data[HEADER.size + meta_len:])), meta
+
+
+def to_chrome_trace(events, metadata):
+    """Chrome trace / Perfetto JSON: one instant event per record, timestamps in microseconds"""
+    names = metadata.get("names", {})
+    trace_events = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": int(tid), "args": {"name": name}}
+                    for tid, name in metadata.get("threads", {}).items()]
+    for seq, t_ns, tid, event, a, b, value in events:
+        name, fields = EVENT_FIELDS.get(event, (f"event_{event}", ("a", "b", "value")))
+        args = {field: v for field, v in zip(fields, (a, b, value)) if field}
+        if "chime" in args and 0 <= args["chime"] < len(names.get("chime", [])):
+            args["chime"] = names["chime"][args["chime"]]
+        trace_events.append({"name": name, "ph": "i", "s": "t", "ts": t_ns / 1000, "pid": 1, "tid": tid,
+                             "args": args})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+# The process-wide trace every module records into
+TRACE = EventTrace()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an event dump to Chrome trace / Perfetto JSON")
+    parser.add_argument("dump", help="File written by EventTrace.dump")
+    parser.add_argument("--output", help="JSON file to write (default: <dump>.json)")
+    args = parser.parse_args()
+    events, metadata = load_dump(args.dump)
+    output = args.output or args.dump + ".json"
+    with open(output, "w") as f:
+        json.dump(to_chrome_trace(events, metadata), f)
+    print(f"Wrote {len(events)} events to {output}; open it in chrome://tracing or ui.perfetto.dev")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
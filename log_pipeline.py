@@ -0,0 +1,112 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the log file at this size...
+LOG_BACKUP_COUNT = 5  # ...keeping this many old files
+LOG_BUFFER_SIZE = 10000  # Records waiting for the writer thread; beyond this new records are dropped, never waited on
+SUBSYSTEM_LEVELS = {"workshop3_1": "INFO", "chime_bank": "INFO"}  # Logger name: level, overridable via HMI_LOG_LEVELS
+ROOT_LEVEL = "WARNING"
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that counts and drops records when the buffer is full instead of blocking the caller"""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Leave formatting to the writer thread; only resolve what may not outlive this call
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Callers only format and enqueue; a QueueListener thread writes the rotating file and the console"""
+    def __init__(self, name, console=True, levels=None, buffer_size=LOG_BUFFER_SIZE):
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        self.path = os.path.join(LOGS_DIR, f"{name}.log")
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [RotatingFileHandler(self.path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)]
+        if console:
+            handlers.append(logging.StreamHandler(sys.stdout))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        self.queue = queue.Queue(maxsize=buffer_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.levels = dict(SUBSYSTEM_LEVELS)
+        self.levels.update(parse_levels(os.environ.get("HMI_LOG_LEVELS", "")))
+        self.levels.update(levels or {})
+        self.running = False
+
+    def start(self):
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        root.setLevel(ROOT_LEVEL)
+        # Gate per subsystem on the caller's side, before a record is even created
+        for name, level in self.levels.items():
+            if isinstance(level, int) or isinstance(logging.getLevelName(level), int):
+                logging.getLogger(name).setLevel(level)
+            else:
+                logging.getLogger(__name__).warning(f"Ignoring unknown log level {level!r} for {name}")
+        self.listener.start()
+        self.running = True
+
+    def stop(self):
+        """Flush what is buffered and detach; safe to call twice"""
+        if not self.running:
+            return
+        self.running = False
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.handler)
+
+    def stats(self):
+        return {"path": self.path, "buffered": self.queue.qsize(), "dropped": self.handler.dropped}
+
+
+def parse_levels(text):
+    """"chime_bank=DEBUG,workshop3_1=WARNING" -> {"chime_bank": "DEBUG", "workshop3_1": "WARNING"}"""
+    levels = {}
+    for part in text.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_pipeline = None
+_lock = threading.Lock()
+
+
+def setup_logging(name="chime", console=True, levels=None):
+    """Start the application's log pipeline once, writing logs/<name>.log; later calls return the running one.
+    Entry points call this; importing workshop3_1 no longer configures logging."""
+    global _pipeline
+    with _lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline(name, console, levels)
+            _pipeline.start()
+            atexit.register(_pipeline.stop)
+        return _pipeline
+
+
+def log_stats():
+    return _pipeline.stats() if _pipeline is not None else None
@@ -0,0 +1,128 @@
+import time
+import functools
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in seconds (Prometheus convention); the last bucket is +Inf
+BUCKETS_S = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def percentiles(values):
+    """Summary statistics (count, mean, p50/p90/p95/p99, max) of a list of samples, in the unit of values"""
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+
+    def pick(fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": values[-1]
+    }
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is a bisect and three additions"""
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_S) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS_S, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations (seconds)"""
+        target = self.count * fraction
+        seen = 0
+        for bound, count in zip(BUCKETS_S, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class OperationMetrics:
+    """Call counts and latency histograms per named operation. Decorate with timed(name); read with
+    stats() in-process or prometheus_text() for GET /api/metrics."""
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def timed(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def stats(self):
+        return {
+            name: {
+                "count": h.count,
+                "total_ms": h.sum * 1000,
+                "mean_ms": h.sum / h.count * 1000 if h.count else 0.0,
+                "p50_ms": h.quantile(0.50) * 1000,
+                "p95_ms": h.quantile(0.95) * 1000,
+                "max_ms": h.max * 1000
+            }
+            for name, h in sorted(self.histograms.items())
+        }
+
+    def reset(self):
+        self.histograms.clear()
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+
+def prometheus_text(operations, counters=(), gauges=()):
+    """Prometheus text exposition format: the operation histograms plus (name, help, value) counters and gauges"""
+    lines = [
+        "# HELP hmi_operation_duration_seconds Time spent in instrumented GUI-thread operations",
+        "# TYPE hmi_operation_duration_seconds histogram"
+    ]
+    for name, h in sorted(list(operations.histograms.items())):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound, count in zip(BUCKETS_S + (float("inf"),), list(h.counts)):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'hmi_operation_duration_seconds_bucket{{operation="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'hmi_operation_duration_seconds_sum{{operation="{label}"}} {h.sum!r}')
+        lines.append(f'hmi_operation_duration_seconds_count{{operation="{label}"}} {cumulative}')
+    for kind, metrics in (("counter", counters), ("gauge", gauges)):
+        for name, help_text, value in metrics:
+            if value is None:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Shared by workshop3_1 and the REST server
+OPERATIONS = OperationMetrics()
@@ -0,0 +1,345 @@
+import os
+import sys
+import json
+import time
+import struct
+import argparse
+import threading
+from datetime import datetime
+from metrics import percentiles
+
+TRACE_MAGIC = b"HMITRACE"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<8sI")  # Magic, version
+RECORD = struct.Struct("<QBHH")  # Nanoseconds since the recording started, op code, deck, card; then the op payload
+LENGTH = struct.Struct("<H")  # Prefix of every string in a binary payload
+ACTIVATION = struct.Struct("<B")
+PROGRESS = struct.Struct("<i")
+OPS = ("activation", "dynamic_text", "progress_bar", "element")
+TRACES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "traces")
+REST_BATCH_MAX = 200  # Largest /api/batch the replayer sends when running flat out
+
+
+class TraceRecord:
+    """One MessageQueue call. For "element" records deck and card are 0 and element_id names the element."""
+    __slots__ = ("t_ns", "op", "deck", "card", "value", "element_id")
+
+    def __init__(self, t_ns, op, deck, card, value, element_id=None):
+        self.t_ns = t_ns
+        self.op = op
+        self.deck = deck
+        self.card = card
+        self.value = value
+        self.element_id = element_id
+
+    def to_json(self):
+        data = {"t_ns": self.t_ns, "op": self.op}
+        if self.element_id is None:
+            data.update(deck=self.deck, card=self.card)
+        else:
+            data["element_id"] = self.element_id
+        data["value"] = self.value
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["t_ns"], data["op"], data.get("deck", 0), data.get("card", 0), data["value"],
+                   data.get("element_id"))
+
+
+def pack_string(text):
+    data = str(text).encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+
+def unpack_string(buf, offset):
+    (length,), offset = LENGTH.unpack_from(buf, offset), offset + LENGTH.size
+    return buf[offset:offset + length].decode("utf-8"), offset + length
+
+
+def encode_record(record):
+    op = OPS.index(record.op)
+    head = RECORD.pack(record.t_ns, op, record.deck, record.card)
+    if record.op == "activation":
+        return head + ACTIVATION.pack(bool(record.value))
+    if record.op == "progress_bar":
+        return head + PROGRESS.pack(int(record.value))
+    if record.op == "dynamic_text":
+        return head + pack_string(record.value)
+    return head + pack_string(record.element_id) + pack_string(record.value)
+
+
+def decode_records(buf):
+    magic, version = HEADER.unpack_from(buf, 0)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"Not a version {TRACE_VERSION} binary trace")
+    offset = HEADER.size
+    while offset < len(buf):
+        t_ns, op, deck, card = RECORD.unpack_from(buf, offset)
+        offset += RECORD.size
+        op = OPS[op]
+        element_id = None
+        if op == "activation":
+            value = bool(ACTIVATION.unpack_from(buf, offset)[0])
+            offset += ACTIVATION.size
+        elif op == "progress_bar":
+            value = PROGRESS.unpack_from(buf, offset)[0]
+            offset += PROGRESS.size
+        elif op == "dynamic_text":
+            value, offset = unpack_string(buf, offset)
+        else:
+            element_id, offset = unpack_string(buf, offset)
+            value, offset = unpack_string(buf, offset)
+        yield TraceRecord(t_ns, op, deck, card, value, element_id)
+
+
+def is_binary(path):
+    return not path.endswith(".jsonl")
+
+
+class TraceRecorder:
+    """Appends MessageQueue calls to a trace file: compact binary, or JSONL when the path ends in .jsonl.
+    Attach with MessageQueue.recorder = TraceRecorder(path); timestamps come from time.monotonic_ns."""
+    def __init__(self, path):
+        self.path = path
+        self.binary = is_binary(path)
+        self.lock = threading.Lock()
+        self.start_ns = time.monotonic_ns()
+        self.count = 0
+        self.dropped = 0  # Calls that do not fit a trace record (e.g. a deck beyond 65535, a string over 64 KiB)
+        self.file = open(path, "wb" if self.binary else "w")
+        if self.binary:
+            self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+
+    def record(self, op, deck, card, value, element_id=None):
+        """Called on the MessageQueue send path, so it never raises: calls it cannot encode are counted in dropped"""
+        try:
+            # Same value types in both formats: a replay from JSONL matches one from the binary trace
+            if op == "activation":
+                value = bool(value)
+            elif op == "progress_bar":
+                value = int(value)
+            else:
+                value = str(value)
+            record = TraceRecord(time.monotonic_ns() - self.start_ns, op, deck, card, value, element_id)
+            data = encode_record(record) if self.binary else json.dumps(record.to_json()) + "\n"
+        except (struct.error, ValueError, TypeError, OverflowError):
+            self.dropped += 1
+            return
+        self.append(data)
+
+    def write(self, record):
+        self.append(encode_record(record) if self.binary else json.dumps(record.to_json()) + "\n")
+
+    def append(self, data):
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(data)
+            self.count += 1
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def default_trace_path(binary=True):
+    os.makedirs(TRACES_DIR, exist_ok=True)
+    suffix = "trace" if binary else "jsonl"
+    return os.path.join(TRACES_DIR, f"scenario_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{suffix}")
+
+
+def read_trace(path):
+    """List of TraceRecords from a binary or JSONL trace"""
+    if is_binary(path):
+        with open(path, "rb") as f:
+            return list(decode_records(f.read()))
+    with open(path) as f:
+        return [TraceRecord.from_json(json.loads(line)) for line in f if line.strip()]
+
+
+def write_trace(path, records):
+    recorder = TraceRecorder(path)
+    for record in records:
+        recorder.write(record)
+    recorder.close()
+
+
+def apply_record(queue, record):
+    if record.op == "activation":
+        queue.send_activation(record.deck, record.card, record.value)
+    elif record.op == "dynamic_text":
+        queue.send_dynamic_text(record.deck, record.card, record.value)
+    elif record.op == "progress_bar":
+        queue.send_progress_bar(record.deck, record.card, record.value)
+    else:
+        queue.send_element(record.element_id, record.value)
+
+
+def rest_command(record, is_telltale_deck):
+    """The /api/control payload that makes the server issue the same MessageQueue call"""
+    if record.op == "activation":
+        return {"type": "telltale" if is_telltale_deck(record.deck) else "deck", "deck_num": record.deck,
+                "card_num": record.card, "action": "activate" if record.value else "deactivate"}
+    if record.op == "element":
+        return {"type": "element", "element_id": record.element_id, "action": "update", "value": record.value}
+    return {"type": record.op, "deck_num": record.deck, "card_num": record.card, "action": "update",
+            "value": record.value}
+
+
+class WindowTarget:
+    """Replays into a MainWindow in this process, letting Qt paint between records"""
+    batch_max = 1  # Flat out, every record still gets its own pass of the event loop (and so its repaint)
+
+    def __init__(self, renderer="widgets"):
+        from PyQt5.QtWidgets import QApplication
+        self.app = QApplication.instance() or QApplication([sys.argv[0]])
+        import workshop3_1
+        self.main_window = workshop3_1.MainWindow(renderer=renderer)
+        self.queue = workshop3_1.MessageQueue(self.main_window)
+        self.main_window.show()
+        self.app.processEvents()
+        self.errors = 0
+
+    def send(self, records):
+        for record in records:
+            try:
+                apply_record(self.queue, record)
+            except (KeyError, ValueError):
+                self.errors += 1
+        self.app.processEvents()
+
+    def idle(self):
+        self.app.processEvents()
+
+    def close(self):
+        self.app.processEvents()
+        self.main_window.close()
+
+
+class RestTarget:
+    """Replays against test_runner_rest_server.py, sending every record that is due as one /api/batch"""
+    batch_max = REST_BATCH_MAX
+
+    def __init__(self, base_url):
+        import requests
+        from workshop3_1 import COMPILED_CONFIG
+        self.requests = requests
+        self.session = requests.Session()
+        self.url = f"{base_url}/api/batch"
+        self.is_telltale_deck = COMPILED_CONFIG.is_telltale_deck
+        self.errors = 0
+
+    def send(self, records):
+        commands = [rest_command(r, self.is_telltale_deck) for r in records]
+        try:
+            resp = self.session.post(self.url, json={"commands": commands}, timeout=10)
+            if resp.status_code != 200:
+                self.errors += len(commands)
+            else:
+                self.errors += sum(1 for r in resp.json().get("results", []) if r.get("status") != "ok")
+        except self.requests.RequestException:
+            self.errors += len(commands)
+
+    def idle(self):
+        pass
+
+    def close(self):
+        self.session.close()
+
+
+def replay(records, target, speed=1.0):
+    """Re-drive records at speed times real time (speed None: as fast as possible).
+    Returns throughput and how far sends slipped behind their schedule."""
+    batch_max = target.batch_max
+    slip_ms = []
+    start = time.perf_counter()
+    i = 0
+    while i < len(records):
+        if speed is None:
+            due = records[i:i + batch_max]
+        else:
+            now_ns = (time.perf_counter() - start) * 1e9 * speed
+            if records[i].t_ns > now_ns:
+                wait = (records[i].t_ns - now_ns) / speed / 1e9
+                target.idle()
+                time.sleep(min(wait, 0.005))
+                continue
+            end = i
+            while end < len(records) and end - i < batch_max and records[end].t_ns <= now_ns:
+                end += 1
+            due = records[i:end]
+            slip_ms.extend((now_ns - r.t_ns) / speed / 1e6 for r in due)
+        target.send(due)
+        i += len(due)
+    elapsed = time.perf_counter() - start
+    trace_s = records[-1].t_ns / 1e9 if records else 0.0
+    target.close()
+    return {
+        "records": len(records),
+        "speed": speed if speed is not None else "max",
+        "trace_s": trace_s,
+        "elapsed_s": elapsed,
+        "effective_speed": trace_s / elapsed if elapsed else None,
+        "records_per_s": len(records) / elapsed if elapsed else None,
+        "slip_ms": percentiles(slip_ms),
+        "errors": target.errors
+    }
+
+
+def parse_speed(text):
+    """"1", "8x" or "max" -> float or None"""
+    text = text.strip().lower()
+    return None if text == "max" else float(text.removesuffix("x"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay or convert MessageQueue scenario traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+    play = sub.add_parser("replay", help="Re-drive a trace")
+    play.add_argument("trace")
+    play.add_argument("--speed", default="1", help='Multiple of real time, e.g. "1", "8x", or "max"')
+    play.add_argument("--target", choices=("window", "rest"), default="window")
+    play.add_argument("--renderer", choices=("widgets", "scene"), default="widgets")
+    play.add_argument("--host", default="127.0.0.1")
+    play.add_argument("--port", type=int, default=8000)
+    play.add_argument("--loops", type=int, default=1, help="Replay the trace this many times back to back")
+    play.add_argument("--output", help="Append the JSON result to this file")
+    convert = sub.add_parser("convert", help="Convert between binary (.trace) and JSONL (.jsonl) traces")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        records = read_trace(args.source)
+        write_trace(args.destination, records)
+        print(f"Wrote {len(records)} records to {args.destination}")
+        return 0
+
+    records = read_trace(args.trace)
+    speed = parse_speed(args.speed)
+    if args.target == "window":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        target = WindowTarget(args.renderer)
+    else:
+        target = RestTarget(f"http://{args.host}:{args.port}")
+    if args.loops > 1 and records:
+        period = records[-1].t_ns + 1
+        records = [TraceRecord(r.t_ns + loop * period, r.op, r.deck, r.card, r.value, r.element_id)
+                   for loop in range(args.loops) for r in records]
+    result = replay(records, target, speed)
+    result.update(trace=args.trace, target=args.target, timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    slip = result["slip_ms"]
+    print(f"{result['records']} records in {result['elapsed_s']:.2f} s "
+          f"({result['records_per_s']:.0f}/s, {result['effective_speed']:.1f}x real time), "
+          f"slip p95 {slip.get('p95', 0):.1f} ms, {result['errors']} errors")
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from workshop3_1 import DECK_GRAPHICS, TELL_TALES, COMPILED_CONFIG
+from metrics import percentiles
+
+DEFAULT_MIX = "deck=2,telltale=2,dynamic_text=4,progress_bar=4,bulk=0.05"
+BULK_ACTIONS = ("activate_all_decks", "deactivate_all_decks", "activate_all_telltales", "deactivate_all_telltales")
+
+
+def parse_mix(text):
+    """"deck=2,telltale=1" -> {"deck": 2.0, "telltale": 1.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"deck", "telltale", "dynamic_text", "progress_bar", "bulk"}
+    if unknown:
+        raise ValueError(f"Unknown command types in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+class CommandGenerator:
+    """Random commands in the TestToolClient payload format"""
+    def __init__(self, mix, seed=None):
+        self.random = random.Random(seed)
+        self.types = list(mix)
+        self.weights = [mix[t] for t in self.types]
+        self.deck_cards = [(d, c) for d, cards in DECK_GRAPHICS.items() for c in cards if c > 0]
+        self.telltale_cards = [(d, c) for d, cards in TELL_TALES.items() for c in cards if c > 0]
+        self.text_cards = [(c.deck_num, c.card_num) for cards in COMPILED_CONFIG.decks.values()
+                           for c in cards if c.dynamic_text]
+        self.bars = [(c.deck_num, c.card_num, c.elements[i]) for cards in COMPILED_CONFIG.decks.values()
+                     for c in cards for i in c.progress_bars]
+
+    def next(self):
+        typ = self.random.choices(self.types, self.weights)[0]
+        if typ == "bulk":
+            return {"type": "bulk", "action": self.random.choice(BULK_ACTIONS)}
+        if typ == "dynamic_text":
+            deck, card = self.random.choice(self.text_cards)
+            return {"type": typ, "deck_num": deck, "card_num": card, "action": "update",
+                    "value": str(self.random.randint(0, 199))}
+        if typ == "progress_bar":
+            deck, card, bar = self.random.choice(self.bars)
+            return {"type": typ, "deck_num": deck, "card_num": card, "action": "update",
+                    "value": str(self.random.randint(bar.minimum, bar.maximum))}
+        deck, card = self.random.choice(self.deck_cards if typ == "deck" else self.telltale_cards)
+        return {"type": typ, "deck_num": deck, "card_num": card,
+                "action": self.random.choice(("activate", "deactivate"))}
+
+
+class SoakClient:
+    """Sends commands from a pool of keep-alive sessions and counts what the server accepted"""
+    def __init__(self, base_url, workers):
+        self.base_url = base_url
+        self.local = threading.local()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.reset_interval()
+
+    def reset_interval(self):
+        with self.lock:
+            self.sent = self.accepted = self.rejected = self.errors = 0
+            self.rtt_ms = deque(maxlen=100000)
+
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def send(self, payload):
+        with self.lock:
+            self.sent += 1
+            self.in_flight += 1
+        self.pool.submit(self.post, payload)
+
+    def post(self, payload):
+        start = time.perf_counter()
+        try:
+            resp = self.session().post(f"{self.base_url}/api/control", json=payload, timeout=5)
+            outcome = "accepted" if resp.status_code == 200 else "rejected"
+        except requests.RequestException:
+            outcome = "errors"
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.rtt_ms.append((time.perf_counter() - start) * 1000)
+            self.in_flight -= 1
+
+    def server_stats(self):
+        try:
+            return self.session().get(f"{self.base_url}/api/stats", timeout=5).json()
+        except (requests.RequestException, ValueError):
+            return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sustained load test of test_runner_rest_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--rate", type=float, default=200, help="Target commands per second")
+    parser.add_argument("--duration", type=float, default=3600, help="Seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Relative weights per command type")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent HTTP connections")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between report lines")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible command sequence")
+    parser.add_argument("--output", default="soak_test_rest.jsonl", help="One JSON report per interval")
+    args = parser.parse_args()
+
+    generator = CommandGenerator(parse_mix(args.mix), args.seed)
+    client = SoakClient(f"http://{args.host}:{args.port}", args.workers)
+    baseline = client.server_stats()
+    if not baseline:
+        print(f"No server answering at {client.base_url}/api/stats")
+        return 1
+    first_rss = baseline.get("rss_bytes")
+    start = time.perf_counter()
+    next_send = start
+    next_report = start + args.interval
+    with open(args.output, "w") as out:
+        while time.perf_counter() - start < args.duration:
+            now = time.perf_counter()
+            while next_send <= now:  # Catch up after oversleeping, so the average rate holds
+                client.send(generator.next())
+                next_send += 1 / args.rate
+            if now >= next_report:
+                with client.lock:
+                    sent, accepted, rejected, errors = client.sent, client.accepted, client.rejected, client.errors
+                    rtt = percentiles(client.rtt_ms)
+                    in_flight = client.in_flight
+                client.reset_interval()
+                stats = client.server_stats()
+                rss = stats.get("rss_bytes")
+                report = {
+                    "elapsed_s": round(now - start, 1),
+                    "target_rate": args.rate,
+                    "sent_rate": sent / args.interval,
+                    "accepted_rate": accepted / args.interval,
+                    "rejected": rejected,
+                    "errors": errors,
+                    "client_in_flight": in_flight,
+                    "rtt_ms": rtt,
+                    "queue_depth": stats.get("queue_depth"),
+                    "lag_ms": stats.get("lag_ms"),
+                    "gui_stall": stats.get("gui_stall"),
+                    "rss_bytes": rss,
+                    "rss_growth_bytes": rss - first_rss if rss is not None and first_rss is not None else None,
+                    "server": stats
+                }
+                out.write(json.dumps(report) + "\n")
+                out.flush()
+                lag = report["lag_ms"] or {}
+                stall = report["gui_stall"] or {}
+                print(f"[{report['elapsed_s']:7.1f}s] accepted {report['accepted_rate']:7.1f}/s "
+                      f"(target {args.rate:g}) queue {report['queue_depth']} "
+                      f"lag p95 {lag.get('p95', 0):.1f} ms stall max {stall.get('max_ms', 0):.1f} ms "
+                      f"rss +{(report['rss_growth_bytes'] or 0) / 1e6:.1f} MB errors {errors}")
+                next_report += args.interval
+            time.sleep(max(0, min(next_send, next_report) - time.perf_counter()))
+    client.pool.shutdown(wait=True)
+    print(f"Reports saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QScrollArea, QMessageBox, QTabWidget, QGroupBox
 )
 from PyQt5.QtCore import QTimer
+from log_pipeline import setup_logging
 from workshop3_1 import MainWindow, MessageQueue, DECK_GRAPHICS, TELL_TALES, ZONE_COORDINATES
 
 
@@ -412,7 +413,7 @@ class TestRunnerWindow(QWidget):
         # Update only dynamic text for the given deck/card in the main window
         if deck < len(self.main_window.decks):
             deck_widget = self.main_window.decks[deck]
-            card_widget = deck_widget.cards[card]
+            card_widget = deck_widget.get_card(card)
             for idx, elem in enumerate(DECK_GRAPHICS.get(deck, {}).get(card, [])):
                 if elem["type"] == "dynamic_text":
                     # Find corresponding QLabel in ui_items
@@ -426,6 +427,7 @@ class TestRunnerWindow(QWidget):
             QMessageBox.information(self, "Text Updated", f"Dynamic text for Deck {deck} Card {card} updated.")
 
 def main():
+    setup_logging("chime")
     app = QApplication(sys.argv)
     test_gui = TestRunnerWindow()
     test_gui.show()
@@ -1,26 +1,382 @@
+import os
 import sys
+import json
+import time
+import asyncio
+import logging
 import threading
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit, QHBoxLayout
-from PyQt5.QtCore import Qt
-from fastapi import FastAPI, Request
+import concurrent.futures
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit, QHBoxLayout, QComboBox
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-import queue
-from workshop3_1 import MainWindow, MessageQueue, DECK_GRAPHICS, TELL_TALES
+from collections import OrderedDict, deque
+from log_pipeline import setup_logging, log_stats
+from event_trace import TRACE, REST_ARRIVAL, REST_DEQUEUE, fit_int32
+from metrics import OPERATIONS, prometheus_text, percentiles
+from scenario_trace import TraceRecorder, default_trace_path
+from workshop3_1 import MainWindow, MessageQueue, DECK_GRAPHICS, TELL_TALES, COMPILED_CONFIG
 
-# Thread-safe queue for REST commands
-task_queue = queue.Queue()
+logger = logging.getLogger(__name__)
+
+BULK_ACTIONS = ("activate_all_decks", "deactivate_all_decks", "activate_all_telltales",
+                "deactivate_all_telltales", "activate_main_window")
+CARD_COMMANDS = ("deck", "card", "telltale", "dynamic_text", "progress_bar")
+BATCH_TIMEOUT_S = 5  # How long /api/batch waits for the Qt thread to apply a batch
+INGRESS_QUEUE_SIZE = 1000  # Commands waiting for the Qt thread before the overload policy applies
+INGRESS_POLICY = "reject"
+OVERLOAD_STATUS = 429  # HTTP status of a refused command (503 also suits clients that back off on it)
+STREAM_BUFFER_FRAMES = 256  # Stream frames buffered for the Qt thread; the oldest is dropped when full
+LAG_WINDOW = 1000  # Recent drains kept for the processing lag statistics
+STALL_PROBE_MS = 10  # Period of the timer that detects GUI thread stalls
+STALL_THRESHOLD_MS = 20  # A probe firing later than this counts as a stall
+
+def rss_bytes():
+    """Resident set size of this process, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class CommandBatch:
+    """Ordered commands applied together in one Qt thread drain; results are returned through future"""
+    def __init__(self, commands, atomic):
+        self.commands = commands
+        self.atomic = atomic
+        self.future = concurrent.futures.Future()
+
+class CommandDropped(Exception):
+    """Set on a queued CommandBatch's future when the drop_oldest policy discards it"""
+
+def coalesce_key(data):
+    """Key under which a newer command supersedes an older one; None for commands that must always run.
+    Only value updates qualify. Activations do not: a deck shows one card at a time, so activate/deactivate
+    of different cards of a deck depend on their order and none of them simply overrides another."""
+    if not isinstance(data, dict):
+        return None
+    typ = data.get("type")
+    deck = data.get("deck_num")
+    card = data.get("card_num")
+    if typ == "element":
+        element_id = data.get("element_id")
+        entry = COMPILED_CONFIG.element_ids.get(element_id) if isinstance(element_id, str) else None
+        return ("element", entry[0], entry[1], entry[2].index) if entry else None
+    if not isinstance(deck, int) or not isinstance(card, int):
+        return None
+    if typ in ("dynamic_text", "progress_bar"):
+        return (typ, deck, card)
+    return None
+
+def coalesce_commands(commands):
+    """Keep only the newest value update per key, each at the position of its last arrival. Updates only
+    set a value, so the last writer of every element is unchanged and the final state matches applying
+    every command in order. Returns (kept, dropped count)."""
+    keys = [coalesce_key(data) for data in commands]
+    last = {key: i for i, key in enumerate(keys) if key is not None}
+    kept = [data for i, (data, key) in enumerate(zip(commands, keys)) if key is None or last[key] == i]
+    return kept, len(commands) - len(kept)
+
+def trace_target(data):
+    """(deck_num, card_num) of a card command for the event trace; -1 for bulk, element, batches and
+    numbers that do not fit the trace's int32 fields"""
+    if not isinstance(data, dict):
+        return -1, -1
+    return fit_int32(data.get("deck_num")), fit_int32(data.get("card_num"))
+
+
+class IngressQueue:
+    """Bounded thread-safe queue of REST commands waiting for the Qt thread. Overload policies:
+    "reject" refuses new commands while full, "drop_oldest" discards the oldest queued command, and
+    "coalesce" replaces a queued value update for the same element (see coalesce_key), refusing the rest when
+    full. The replacement moves to the back, its last arrival; activations are never replaced or reordered,
+    since the card a deck shows depends on their order."""
+    POLICIES = ("reject", "drop_oldest", "coalesce")
+
+    def __init__(self, max_size=INGRESS_QUEUE_SIZE, policy=INGRESS_POLICY):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overload policy: {policy}")
+        self.max_size = max_size
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.items = OrderedDict()  # coalesce_key or sequence number: (queued time, command), oldest first
+        self.sequence = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, data):
+        """Called from the server thread; returns False if the command was refused"""
+        key = coalesce_key(data) if self.policy == "coalesce" else None
+        evicted = None
+        with self.lock:
+            if key is not None and key in self.items:
+                del self.items[key]
+                self.coalesced += 1
+            elif len(self.items) >= self.max_size:
+                if self.policy != "drop_oldest":
+                    self.rejected += 1
+                    return False
+                _, (_, evicted) = self.items.popitem(last=False)
+                self.dropped += 1
+            if key is None:
+                self.sequence += 1
+                key = self.sequence
+            self.items[key] = (time.perf_counter(), data)
+        if isinstance(evicted, CommandBatch):
+            # Its /api/batch caller is still waiting: answer it as overloaded rather than let it time out
+            evicted.future.set_exception(CommandDropped("command queue full"))
+        return True
+
+    def take_all(self):
+        """Remove and return every queued (queued time, command), oldest first"""
+        with self.lock:
+            items = list(self.items.values())
+            self.items.clear()
+        return items
+
+    def depth(self):
+        return len(self.items)
+
+    def lag_ms(self):
+        """How long the oldest queued command has been waiting"""
+        with self.lock:
+            if not self.items:
+                return 0.0
+            queued, _ = next(iter(self.items.values()))
+        return (time.perf_counter() - queued) * 1000
+
+    def stats(self):
+        return {
+            "policy": self.policy,
+            "max_size": self.max_size,
+            "depth": self.depth(),
+            "lag_ms": self.lag_ms(),
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced
+        }
+
+
+class CommandDispatcher(QObject):
+    """Wakes the Qt thread as soon as a REST command is queued and drains all pending commands in one batch"""
+    wake = pyqtSignal()
+
+    def __init__(self, handler, batch_handler, stream_handler):
+        super().__init__()
+        self.handler = handler
+        self.batch_handler = batch_handler
+        self.stream_handler = stream_handler
+        self.ingress = IngressQueue()
+        self.stream = deque(maxlen=STREAM_BUFFER_FRAMES)  # Bounded: a stalled GUI cannot grow it
+        self.stream_dropped = 0
+        self.coalesced = 0  # Updates superseded by a newer value before they reached MessageQueue
+        self.received = 0
+        self.handled = 0
+        self.errors = 0  # Commands whose handler raised
+        self.lag_ms = deque(maxlen=LAG_WINDOW)  # Per drain: queued-to-applied time of its oldest command
+        self.wake_pending = threading.Event()  # One queued wake-up covers every command put before the drain
+        self.wake.connect(self.drain, Qt.QueuedConnection)
+
+    def submit(self, data):
+        """Called from the server thread; returns False if the overload policy refused the command"""
+        self.received += 1
+        if not self.ingress.put(data):
+            return False
+        TRACE.emit(REST_ARRIVAL, *trace_target(data), self.ingress.depth())
+        self.request_drain()
+        return True
+
+    def submit_stream(self, updates):
+        """Called from the server thread with one decoded stream frame ({element_id: value, ...})"""
+        if len(self.stream) == self.stream.maxlen:
+            self.stream_dropped += 1
+        self.stream.append(updates)
+        self.request_drain()
+
+    def request_drain(self):
+        if not self.wake_pending.is_set():
+            self.wake_pending.set()
+            self.wake.emit()
+
+    def submit_batch(self, commands, atomic=False):
+        """Called from the server thread; the returned batch's future resolves once it is applied.
+        Returns None if the overload policy refused the batch."""
+        batch = CommandBatch(commands, atomic)
+        return batch if self.submit(batch) else None
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "handled": self.handled,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "queue_depth": self.ingress.depth(),
+            "ingress": self.ingress.stats(),
+            "stream_buffered": len(self.stream),
+            "stream_dropped": self.stream_dropped,
+            "lag_ms": percentiles(self.lag_ms)
+        }
+
+    def drain(self):
+        self.wake_pending.clear()
+        batch = self.ingress.take_all()
+        oldest = batch[0][0] if batch else None
+        now = time.perf_counter()
+        for queued, data in batch:
+            TRACE.emit(REST_DEQUEUE, *trace_target(data), int((now - queued) * 1e6))
+        batch, dropped = coalesce_commands([data for _, data in batch])
+        self.coalesced += dropped
+        for data in batch:
+            try:
+                if isinstance(data, CommandBatch):
+                    self.batch_handler(data)
+                else:
+                    self.handler(data)
+            except Exception as e:  # An exception escaping this slot would abort the whole server
+                self.errors += 1
+                logger.error(f"REST command failed: {data!r}: {e}")
+                if isinstance(data, CommandBatch) and not data.future.done():
+                    data.future.set_exception(e)
+        self.handled += len(batch)
+        if oldest is not None:
+            self.lag_ms.append((time.perf_counter() - oldest) * 1000)
+        updates = {}
+        received = 0
+        while self.stream:
+            frame = self.stream.popleft()
+            received += len(frame)
+            updates.update(frame)
+        if updates:
+            self.coalesced += received - len(updates)
+            try:
+                self.stream_handler(updates)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"REST stream update failed: {e}")
+
+class StallMonitor(QObject):
+    """Measures how late a short periodic timer fires, i.e. how long the GUI thread was blocked"""
+    def __init__(self, interval_ms=STALL_PROBE_MS):
+        super().__init__()
+        self.interval_ms = interval_ms
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start(self.interval_ms)
+
+    def tick(self):
+        now = time.perf_counter()
+        late_ms = (now - self.last) * 1000 - self.interval_ms
+        self.last = now
+        if late_ms > STALL_THRESHOLD_MS:
+            self.count += 1
+            self.total_ms += late_ms
+            self.max_ms = max(self.max_ms, late_ms)
+
+    def stats(self):
+        return {"count": self.count, "total_ms": self.total_ms, "max_ms": self.max_ms}
 
 # FastAPI app
-def create_api(main_window):
+def create_api(main_window, dispatcher, stats):
     app = FastAPI()
     app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
+    def queue_headers():
+        return {"X-Queue-Depth": str(dispatcher.ingress.depth()), "X-Queue-Lag-Ms": f"{dispatcher.ingress.lag_ms():.1f}"}
+
+    def overloaded():
+        return JSONResponse(status_code=OVERLOAD_STATUS, content={"status": "rejected", "error": "command queue full"},
+                            headers=dict(queue_headers(), **{"Retry-After": "1"}))
+
     @app.post("/api/control")
     async def control(request: Request):
         data = await request.json()
-        task_queue.put(data)
-        return {"status": "received"}
+        if not dispatcher.submit(data):
+            return overloaded()
+        return JSONResponse(content={"status": "received"}, headers=queue_headers())
+
+    @app.get("/api/stats")
+    async def server_stats():
+        return stats()
+
+    @app.get("/api/metrics")
+    async def metrics():
+        # Prometheus text format: GUI-thread operation timings plus the counters of /api/stats
+        s = stats()
+        ingress = s["ingress"]
+        stall = s["gui_stall"]
+        counters = [
+            ("hmi_rest_commands_received_total", "Control commands received", s["received"]),
+            ("hmi_rest_commands_handled_total", "Control commands applied on the Qt thread", s["handled"]),
+            ("hmi_rest_commands_coalesced_total", "Updates superseded before they were applied", s["coalesced"]),
+            ("hmi_rest_commands_rejected_total", "Commands refused by the overload policy", ingress["rejected"]),
+            ("hmi_rest_commands_dropped_total", "Queued commands discarded by drop_oldest", ingress["dropped"]),
+            ("hmi_gui_stalls_total", "Stall probe ticks that fired late", stall["count"]),
+            ("hmi_gui_stall_seconds_total", "Time the GUI thread was blocked beyond the stall probe", stall["total_ms"] / 1000),
+            ("hmi_log_records_dropped_total", "Log records dropped because the log buffer was full",
+             (s["logging"] or {}).get("dropped"))
+        ]
+        gauges = [
+            ("hmi_rest_queue_depth", "Commands waiting for the Qt thread", s["queue_depth"]),
+            ("hmi_rest_queue_lag_seconds", "How long the oldest queued command has been waiting", ingress["lag_ms"] / 1000),
+            ("hmi_gui_stall_max_seconds", "Longest GUI thread stall seen", stall["max_ms"] / 1000),
+            ("hmi_process_resident_memory_bytes", "Resident set size of the server process", s["rss_bytes"])
+        ]
+        return PlainTextResponse(prometheus_text(OPERATIONS, counters, gauges), media_type="text/plain; version=0.0.4")
+
+    @app.get("/api/trace")
+    async def event_trace():
+        # Chrome trace / Perfetto JSON of the in-memory event ring, for a post-mortem timeline
+        return TRACE.chrome_trace()
+
+    @app.post("/api/batch")
+    async def control_batch(request: Request):
+        # Body: {"commands": [<control command>, ...], "atomic": false}
+        data = await request.json()
+        commands = data.get("commands") if isinstance(data, dict) else None
+        if not isinstance(commands, list):
+            return JSONResponse(status_code=400, content={"status": "error", "error": "'commands' must be a list"})
+        batch = dispatcher.submit_batch(commands, bool(data.get("atomic", False)))
+        if batch is None:
+            return overloaded()
+        try:
+            applied, results = await asyncio.wait_for(asyncio.wrap_future(batch.future), BATCH_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            return JSONResponse(status_code=504, content={"status": "timeout"})
+        except CommandDropped:
+            return overloaded()
+        # 422 for an atomic batch rejected by validation: nothing was applied
+        return JSONResponse(status_code=200 if applied else 422,
+                            content={"status": "applied" if applied else "rejected", "results": results},
+                            headers=queue_headers())
+
+    @app.websocket("/api/stream")
+    async def stream(websocket: WebSocket):
+        # Each text frame is a JSON object of element updates, e.g. {"speed": 88, "range_bar": 40}
+        await websocket.accept()
+        try:
+            while True:
+                frame = await websocket.receive_text()
+                try:
+                    updates = json.loads(frame)
+                except ValueError:
+                    updates = None
+                if not isinstance(updates, dict):
+                    await websocket.send_json({"status": "error", "error": "frame must be a JSON object"})
+                    continue
+                dispatcher.submit_stream(updates)
+        except WebSocketDisconnect:
+            pass
 
     return app
 
@@ -59,26 +415,38 @@ class TestRunnerServer(QWidget):
         ip_layout.addWidget(self.ip_input)
         ip_layout.addWidget(QLabel("Port:"))
         ip_layout.addWidget(self.port_input)
+        self.policy_combo = QComboBox()
+        self.policy_combo.addItems(IngressQueue.POLICIES)
+        self.policy_combo.setCurrentText(INGRESS_POLICY)
+        ip_layout.addWidget(QLabel("Overload:"))
+        ip_layout.addWidget(self.policy_combo)
         self.layout.addLayout(ip_layout)
         self.layout.addWidget(self.start_btn)
         self.layout.addWidget(self.stop_btn)
+        self.record_btn = QPushButton("Start Recording")
+        self.layout.addWidget(self.record_btn)
         self.layout.addWidget(QLabel("Log:"))
         self.layout.addWidget(self.log_box)
 
         self.start_btn.clicked.connect(self.start_server)
         self.stop_btn.clicked.connect(self.stop_server)
+        self.record_btn.clicked.connect(self.toggle_recording)
 
         self.server_thread = None
         self.api = None
         self.main_window = MainWindow()
         self.queue = MessageQueue(self.main_window)
         self.running = False
-        self.timer = self.startTimer(100)  # 100 ms polling
+        self.dispatcher = CommandDispatcher(self.handle_command, self.handle_batch, self.handle_stream)
+        self.stream_stats = {"drains": 0, "updates": 0, "errors": 0}
+        self.stall_monitor = StallMonitor()
 
     def start_server(self):
         host = self.ip_input.text()
         port = int(self.port_input.text())
-        self.api = create_api(self.main_window)
+        self.dispatcher.ingress.policy = self.policy_combo.currentText()
+        self.api = create_api(self.main_window, self.dispatcher, self.stats)
+        self.stall_monitor.start()
         self.server_thread = ServerThread(self.api, host, port)
         self.server_thread.start()
         self.log_box.append(f"Server started at http://{host}:{port}")
@@ -93,83 +461,174 @@ class TestRunnerServer(QWidget):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
 
+    def toggle_recording(self):
+        """Record every MessageQueue call to a trace under traces/, for scenario_trace.py replay"""
+        recorder = self.queue.recorder
+        if recorder is None:
+            self.queue.recorder = TraceRecorder(default_trace_path())
+            self.record_btn.setText("Stop Recording")
+            self.log_box.append(f"Recording commands to {self.queue.recorder.path}")
+        else:
+            self.queue.recorder = None
+            recorder.close()
+            self.record_btn.setText("Start Recording")
+            dropped = f" ({recorder.dropped} too large to record)" if recorder.dropped else ""
+            self.log_box.append(f"Recorded {recorder.count} commands to {recorder.path}{dropped}")
+
     def activate_main_window(self):
         self.main_window.show()
         self.main_window.raise_()
 
-    def timerEvent(self, event):
-        # Poll the queue for REST commands
-        while not task_queue.empty():
-            data = task_queue.get()
-            self.handle_command(data)
+    def validate_command(self, data):
+        """Return why a control command cannot be applied, or None if it is valid"""
+        if not isinstance(data, dict):
+            return "command must be an object"
+        typ = data.get("type")
+        if not isinstance(typ, str):
+            return "type must be a string"
+        if typ == "bulk":
+            if data.get("action") not in BULK_ACTIONS:
+                return f"Unknown bulk action: {data.get('action')}"
+        elif typ in CARD_COMMANDS:
+            deck = data.get("deck_num")
+            card = data.get("card_num")
+            if not isinstance(deck, int) or not isinstance(card, int):
+                return "deck_num and card_num must be integers"
+            if not 0 <= card < len(COMPILED_CONFIG.decks.get(deck, ())):
+                return f"Unknown deck/card: {deck}/{card}"
+        elif typ == "element":
+            element_id = data.get("element_id")
+            if not isinstance(element_id, str):
+                return "element_id must be a string"
+            if element_id not in COMPILED_CONFIG.element_ids:
+                return f"Unknown element id: {element_id}"
+        else:
+            return f"Unknown command type: {typ}"
+        return None
+
+    def execute_command(self, data):
+        error = self.validate_command(data)
+        if error:
+            raise ValueError(error)
+        typ = data.get("type")
+        deck = data.get("deck_num")
+        card = data.get("card_num")
+        action = data.get("action")
+        value = data.get("value")
+        if typ == "bulk":
+            if action == "activate_all_decks":
+                self.activate_all_decks()
+                self.log_box.append("Bulk: Activated all decks via REST.")
+            elif action == "deactivate_all_decks":
+                self.deactivate_all_decks()
+                self.log_box.append("Bulk: Deactivated all decks via REST.")
+            elif action == "activate_all_telltales":
+                self.activate_all_telltales()
+                self.log_box.append("Bulk: Activated all telltales via REST.")
+            elif action == "deactivate_all_telltales":
+                self.deactivate_all_telltales()
+                self.log_box.append("Bulk: Deactivated all telltales via REST.")
+            elif action == "activate_main_window":
+                self.activate_main_window()
+                self.log_box.append("Bulk: Activated main window via REST.")
+        elif typ in ("deck", "card", "telltale"):
+            activation_status = action == "activate"
+            self.queue.send_activation(deck, card, activation_status)
+            self.log_box.append(f"send_activation({deck}, {card}, {activation_status})")
+        elif typ == "dynamic_text":
+            self.queue.send_dynamic_text(deck, card, value)
+            self.log_box.append(f"send_dynamic_text({deck}, {card}, {value})")
+        elif typ == "progress_bar":
+            self.queue.send_progress_bar(deck, card, value)
+            self.log_box.append(f"send_progress_bar({deck}, {card}, {value})")
+        elif typ == "element":
+            element_id = data.get("element_id")
+            self.queue.send_element(element_id, value)
+            self.log_box.append(f"send_element({element_id}, {value})")
+
+    def stats(self):
+        """Server health for /api/stats; read from the server thread, values may be a drain apart"""
+        return dict(self.dispatcher.stats(), stream=dict(self.stream_stats),
+                    gui_stall=self.stall_monitor.stats(), rss_bytes=rss_bytes(),
+                    logging=log_stats())
 
     def handle_command(self, data):
         try:
-            typ = data.get("type")
-            deck = data.get("deck_num")
-            card = data.get("card_num")
-            action = data.get("action")
-            value = data.get("value")
-            if typ == "bulk":
-                if action == "activate_all_decks":
-                    self.activate_all_decks()
-                    self.log_box.append("Bulk: Activated all decks via REST.")
-                elif action == "deactivate_all_decks":
-                    self.deactivate_all_decks()
-                    self.log_box.append("Bulk: Deactivated all decks via REST.")
-                elif action == "activate_all_telltales":
-                    self.activate_all_telltales()
-                    self.log_box.append("Bulk: Activated all telltales via REST.")
-                elif action == "deactivate_all_telltales":
-                    self.deactivate_all_telltales()
-                    self.log_box.append("Bulk: Deactivated all telltales via REST.")
-                elif action == "activate_main_window":
-                    self.activate_main_window()
-                    self.log_box.append("Bulk: Activated main window via REST.")
-                else:
-                    self.log_box.append(f"Unknown bulk action: {action}")
-            elif typ in ("deck", "card", "telltale"):
-                activation_status = action == "activate"
-                self.queue.send_activation(deck, card, activation_status)
-                self.log_box.append(f"send_activation({deck}, {card}, {activation_status})")
-            elif typ == "dynamic_text":
-                self.queue.send_dynamic_text(deck, card, value)
-                self.log_box.append(f"send_dynamic_text({deck}, {card}, {value})")
-            elif typ == "progress_bar":
-                self.queue.send_progress_bar(deck, card, value)
-                self.log_box.append(f"send_progress_bar({deck}, {card}, {value})")
+            self.execute_command(data)
             self.log_box.append(f"Handled: {data}")
         except Exception as e:
             self.log_box.append(f"Error handling command: {e}")
 
+    def handle_batch(self, batch):
+        """Apply a CommandBatch within one drain, so no frame is painted between its commands.
+        An atomic batch is validated up front and rejected as a whole if any command is invalid."""
+        if batch.atomic:
+            errors = []
+            for data in batch.commands:
+                try:
+                    errors.append(self.validate_command(data))
+                except Exception as e:
+                    errors.append(f"Invalid command: {e}")
+            if any(errors):
+                results = [{"index": i, "status": "error", "error": e} if e else {"index": i, "status": "skipped"}
+                           for i, e in enumerate(errors)]
+                self.log_box.append(f"Rejected atomic batch of {len(batch.commands)} commands")
+                batch.future.set_result((False, results))
+                return
+        results = []
+        with self.queue.transaction():
+            for i, data in enumerate(batch.commands):
+                try:
+                    self.execute_command(data)
+                    results.append({"index": i, "status": "ok"})
+                except Exception as e:
+                    results.append({"index": i, "status": "error", "error": str(e)})
+        self.log_box.append(f"Handled batch of {len(batch.commands)} commands")
+        batch.future.set_result((True, results))
+
+    def handle_stream(self, updates):
+        """Apply the newest streamed value per element; too frequent to echo each one in the log box"""
+        self.stream_stats["drains"] += 1
+        for element_id, value in updates.items():
+            try:
+                self.queue.send_element(element_id, value)
+                self.stream_stats["updates"] += 1
+            except (KeyError, ValueError, TypeError):
+                self.stream_stats["errors"] += 1
+
     def activate_all_decks(self):
-        for deck_num, cards in DECK_GRAPHICS.items():
-            for card_num in cards:
-                if card_num > 0:
-                    self.queue.send_activation(deck_num, card_num, True)
+        with self.queue.transaction():
+            for deck_num, cards in DECK_GRAPHICS.items():
+                for card_num in cards:
+                    if card_num > 0:
+                        self.queue.send_activation(deck_num, card_num, True)
         self.log_box.append("All deck cards activated.")
 
     def deactivate_all_decks(self):
-        for deck_num, cards in DECK_GRAPHICS.items():
-            for card_num in cards:
-                self.queue.send_activation(deck_num, card_num, False)
+        with self.queue.transaction():
+            for deck_num, cards in DECK_GRAPHICS.items():
+                for card_num in cards:
+                    self.queue.send_activation(deck_num, card_num, False)
         self.log_box.append("All deck cards deactivated.")
 
     def activate_all_telltales(self):
         self.main_window.show()
-        for deck_num, cards in TELL_TALES.items():
-            for card_num in cards:
-                if card_num > 0 and card_num in TELL_TALES[deck_num]:
-                    self.queue.send_activation(deck_num, card_num, True)
+        with self.queue.transaction():
+            for deck_num, cards in TELL_TALES.items():
+                for card_num in cards:
+                    if card_num > 0 and card_num in TELL_TALES[deck_num]:
+                        self.queue.send_activation(deck_num, card_num, True)
         self.log_box.append("All telltale cards activated.")
 
     def deactivate_all_telltales(self):
-        for deck_num, cards in TELL_TALES.items():
-            for card_num in cards:
-                self.queue.send_activation(deck_num, card_num, False)
+        with self.queue.transaction():
+            for deck_num, cards in TELL_TALES.items():
+                for card_num in cards:
+                    self.queue.send_activation(deck_num, card_num, False)
         self.log_box.append("All telltale cards deactivated.")
 
 if __name__ == "__main__":
+    setup_logging("test_runner")
     app = QApplication(sys.argv)
     server = TestRunnerServer()
     server.show()
@@ -1,8 +1,77 @@
 import sys
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
 import requests
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QTextEdit, QHBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from workshop3_1 import DECK_GRAPHICS, TELL_TALES
+from metrics import percentiles
+
+RTT_HISTORY = 1000  # Round-trip times kept for the p50/p95 shown in the client
+
+
+class CommandSender(QObject):
+    """Posts requests in order from a worker thread over one keep-alive session, so the UI never waits
+    on the network and consecutive commands reuse the same connection"""
+    finished = pyqtSignal(object)  # Result dict of each request, delivered on the Qt thread
+
+    def __init__(self):
+        super().__init__()
+        self.session = requests.Session()
+        self.pending = queue.Queue()
+        self.rtt_ms = deque(maxlen=RTT_HISTORY)
+        self.thread = threading.Thread(target=self.run, name="rest-sender", daemon=True)
+        self.thread.start()
+
+    def post(self, url, payload, kind, timeout=2):
+        """Queue a request; the returned future resolves to the same result dict that finished carries, or to
+        the exception for anything other than a network error"""
+        future = Future()
+        self.pending.put((url, payload, kind, timeout, future))
+        return future
+
+    def run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            url, payload, kind, timeout, future = item
+            result = {"kind": kind, "payload": payload, "status_code": None, "text": "", "data": None, "error": None}
+            start = time.perf_counter()
+            failure = None
+            try:
+                resp = self.session.post(url, json=payload, timeout=timeout)
+                result.update(status_code=resp.status_code, text=resp.text)
+                try:
+                    result["data"] = resp.json()
+                except ValueError:
+                    pass
+            except requests.RequestException as e:
+                result["error"] = str(e)
+            except Exception as e:
+                # E.g. a payload json cannot encode: fail this request only, the thread keeps serving the queue
+                result["error"] = f"{type(e).__name__}: {e}"
+                failure = e
+            result["rtt_ms"] = (time.perf_counter() - start) * 1000
+            result["queued"] = self.pending.qsize()
+            self.rtt_ms.append(result["rtt_ms"])
+            if failure is None:
+                future.set_result(result)
+            else:
+                future.set_exception(failure)
+            self.finished.emit(result)
+
+    def rtt_stats(self):
+        return percentiles(list(self.rtt_ms))
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join(timeout=2)
+        self.session.close()
+
 
 class TestToolClient(QWidget):
     def __init__(self):
@@ -70,6 +139,8 @@ class TestToolClient(QWidget):
         self.log_box.setReadOnly(True)
         self.layout.addWidget(QLabel("Log:"))
         self.layout.addWidget(self.log_box)
+        self.rtt_label = QLabel("Round trip: -")
+        self.layout.addWidget(self.rtt_label)
 
         self.activate_all_decks_btn = QPushButton("Activate All Decks")
         self.deactivate_all_decks_btn = QPushButton("Deactivate All Decks")
@@ -93,6 +164,9 @@ class TestToolClient(QWidget):
         self.action_combo.currentTextChanged.connect(self.on_action_changed)
         self.send_btn.clicked.connect(self.send_command)
 
+        self.command_sender = CommandSender()
+        self.command_sender.finished.connect(self.on_response)
+
         self.populate_decks()
         self.on_type_changed(self.type_combo.currentText())
 
@@ -155,11 +229,7 @@ class TestToolClient(QWidget):
         if value:
             payload["value"] = value
         url = f"http://{host}:{port}/api/control"
-        try:
-            resp = requests.post(url, json=payload, timeout=2)
-            self.log_box.append(f"Sent: {payload}\nResponse: {resp.text}")
-        except Exception as e:
-            self.log_box.append(f"Error sending command: {e}")
+        return self.command_sender.post(url, payload, "command")
 
     def send_bulk_command(self, action):
         host = self.ip_input.text()
@@ -169,11 +239,35 @@ class TestToolClient(QWidget):
             "action": action
         }
         url = f"http://{host}:{port}/api/control"
-        try:
-            resp = requests.post(url, json=payload, timeout=2)
-            self.log_box.append(f"Sent bulk: {payload}\nResponse: {resp.text}")
-        except Exception as e:
-            self.log_box.append(f"Error sending bulk command: {e}")
+        return self.command_sender.post(url, payload, "bulk command")
+
+    def send_batch(self, commands, atomic=False):
+        """Send an ordered list of control commands in one request. Returns a future of the result dict;
+        its "data" holds the per-command "results" once the server answered."""
+        host = self.ip_input.text()
+        port = self.port_input.text()
+        url = f"http://{host}:{port}/api/batch"
+        return self.command_sender.post(url, {"commands": commands, "atomic": atomic}, "batch", timeout=10)
+
+    def on_response(self, result):
+        kind = result["kind"]
+        payload = result["payload"]
+        if kind == "batch":
+            payload = f"{len(payload['commands'])} commands"
+        if result["error"]:
+            self.log_box.append(f"Error sending {kind}: {result['error']}")
+        elif kind == "batch":
+            self.log_box.append(f"Sent batch of {payload}\nResponse: {result['status_code']} "
+                                f"{(result['data'] or {}).get('status')} ({result['rtt_ms']:.1f} ms)")
+        else:
+            self.log_box.append(f"Sent {kind}: {payload}\nResponse: {result['text']} ({result['rtt_ms']:.1f} ms)")
+        stats = self.command_sender.rtt_stats()
+        self.rtt_label.setText(f"Round trip: last {result['rtt_ms']:.1f} ms, p50 {stats['p50']:.1f} ms, "
+                               f"p95 {stats['p95']:.1f} ms over {stats['count']} requests, {result['queued']} queued")
+
+    def closeEvent(self, event):
+        self.command_sender.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
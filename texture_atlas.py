@@ -0,0 +1,66 @@
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+
+SHEET_SIZE = 2048  # Width and maximum height of one atlas sheet
+PADDING = 1  # Transparent gutter around every sprite so filtered draws never pick up a neighbour
+
+
+class TextureAtlas:
+    """Sprites packed into a few sheets; sprite(key) returns (sheet pixmap, source rect) for drawPixmap"""
+    def __init__(self, sheets, rects):
+        self.sheets = sheets  # QPixmap per sheet
+        self.rects = rects  # key: (sheet index, QRect inside that sheet)
+
+    def sprite(self, key):
+        entry = self.rects.get(key)
+        if entry is None:
+            return None
+        sheet_index, rect = entry
+        return self.sheets[sheet_index], rect
+
+    def stats(self):
+        return {
+            "sprites": len(self.rects),
+            "sheets": len(self.sheets),
+            "sheet_bytes": sum(s.width() * s.height() * s.depth() // 8 for s in self.sheets)
+        }
+
+
+def build_atlas(images, sheet_size=SHEET_SIZE, padding=PADDING):
+    """Shelf-pack {key: QImage} tallest first into as few sheets as needed.
+    Images that do not fit on an empty sheet are left out; callers keep drawing those on their own."""
+    placements = []  # (key, sheet index, x, y)
+    sheet_heights = []
+    x = y = shelf_height = 0
+    order = sorted(images, key=lambda k: (-images[k].height(), -images[k].width(), k))
+    for key in order:
+        w = images[key].width() + 2 * padding
+        h = images[key].height() + 2 * padding
+        if w > sheet_size or h > sheet_size:
+            continue
+        if not sheet_heights or x + w > sheet_size:  # Start a new shelf
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if not sheet_heights or y + h > sheet_size:  # Start a new sheet
+            sheet_heights.append(0)
+            x = y = shelf_height = 0
+        placements.append((key, len(sheet_heights) - 1, x, y))
+        shelf_height = max(shelf_height, h)
+        sheet_heights[-1] = max(sheet_heights[-1], y + h)
+        x += w
+
+    sheet_images = [QImage(sheet_size, height, QImage.Format_ARGB32_Premultiplied) for height in sheet_heights]
+    for sheet in sheet_images:
+        sheet.fill(Qt.transparent)
+    rects = {}
+    painters = [QPainter(sheet) for sheet in sheet_images]
+    for painter in painters:
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+    for key, sheet_index, x, y in placements:
+        image = images[key]
+        painters[sheet_index].drawImage(x + padding, y + padding, image)
+        rects[key] = (sheet_index, QRect(x + padding, y + padding, image.width(), image.height()))
+    for painter in painters:
+        painter.end()
+    return TextureAtlas([QPixmap.fromImage(sheet) for sheet in sheet_images], rects)
@@ -3,38 +3,21 @@ import os
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QProgressBar
 )
-from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import QUrl
+from PyQt5.QtGui import QPixmap, QFont, QPainter, QColor, QFontMetrics, QImageReader
+from PyQt5.QtCore import Qt, QTimer, QRect, QSize
 import logging
-from datetime import datetime
-
-# Setup minimal logging for chimes only
-def setup_chime_logging():
-    """Setup logging configuration for chime events only"""
-    # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.path.dirname(__file__), "logs")
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    
-    # Create log filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = os.path.join(logs_dir, f"chime_log_{timestamp}.log")
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename, mode='w'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    return logging.getLogger(__name__)
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from chime_bank import ChimeBank
+from asset_pack import AssetPack, asset_key
+from texture_atlas import build_atlas
+from metrics import OPERATIONS
+from event_trace import (TRACE, CARD_ACTIVATE, CARD_DEACTIVATE, TELLTALE_ACTIVATE, TELLTALE_DEACTIVATE, ZONE_UPDATE,
+                         ZONE_CYCLE, BLINK_TOGGLE, FRAME_COMMIT)
 
-# Initialize logger for chime events only
-logger = setup_chime_logging()
+# Configured by the entry point (log_pipeline.setup_logging), not on import
+logger = logging.getLogger(__name__)
 
 
 
@@ -42,6 +25,13 @@ DEFAULT_CARD_LENGTH = 10
 BG_RESOLUTION = (1920, 720)
 IMAGE_DIR = os.path.join(os.path.dirname(__file__), "Images")
 CHIMES_DIR = os.path.join(os.path.dirname(__file__), "chimes")
+ASSET_PACK_PATH = os.path.join(os.path.dirname(__file__), "assets.pack")  # Built by asset_pack.py, optional
+TELLTALE_SCALE = 0.5  # Telltale icons are drawn at half their source size
+ATLAS_MAX_ICON = 256  # Images up to this width and height (as drawn) go into the scene renderer's icon atlas
+PIXMAP_CACHE_BUDGET = 64 * 1024 * 1024  # Bytes of decoded pixmaps kept in memory
+BLINK_PERIOD_MS = 1000  # Full on+off cycle shared by every blinking telltale
+FRAME_INTERVAL_MS = 1000 / 60  # Frame tick that queued activation changes are committed on
+DIRTY_STATS_WINDOW = 300  # Number of recent SceneCanvas frames kept for dirty-area statistics
 
 # Zone coordinates for telltales
 ZONE_COORDINATES = {
@@ -67,6 +57,20 @@ CHIME_FILES = {
     "jeep_seatbelt_alert"       : "jeep_seatbelt_alert.mp3"
 }
 
+# Mixer priority per chime (higher wins). Lower priority voices are ducked while a higher
+# one plays and are preempted first when all mixer voices are busy.
+CHIME_PRIORITIES = {
+    "blinker"                   : 1,
+    "door_ajar"                 : 2,
+    "jeep_door_open"            : 2,
+    "parking_brake_engaged"     : 2,
+    "jeep_key_left_in_ignition" : 2,
+    "low_fuel"                  : 2,
+    "tire_pressure_warning"     : 3,
+    "engine_check"              : 3,
+    "jeep_seatbelt_alert"       : 3
+}
+
 
 
 
@@ -128,42 +132,42 @@ DECK_GRAPHICS = {
     },
     11: {
         0: [],
-        1: [{"type": "dynamic_text", "value": "08:30 AM", "x": 1350, "y": 45, "font_family": "HYQiHei", "font_size": 20, "font_color": "#47473F", "opacity": 100}]
+        1: [{"id": "clock", "type": "dynamic_text", "value": "08:30 AM", "x": 1350, "y": 45, "font_family": "HYQiHei", "font_size": 20, "font_color": "#47473F", "opacity": 100}]
     },
     12: {
         0: [],
-        1: [{"type": "dynamic_text", "value": "26℃", "x": 1620, "y": 45, "font_family": "HYQiHei", "font_size": 20, "font_color": "#47473F", "opacity": 100}]
+        1: [{"id": "outside_temperature", "type": "dynamic_text", "value": "26℃", "x": 1620, "y": 45, "font_family": "HYQiHei", "font_size": 20, "font_color": "#47473F", "opacity": 100}]
     },
     13: {
         0: [],
         1: [
-            {"type": "dynamic_text", "value": "85", "x": 100, "y": 275, "font_family": "HFBUBU", "font_size": 80, "font_color": "#47473F", "opacity": 100},
+            {"id": "speed", "type": "dynamic_text", "value": "85", "x": 100, "y": 275, "font_family": "HFBUBU", "font_size": 80, "font_color": "#47473F", "opacity": 100},
             {"type": "static_text", "value": "km/h", "x": 380, "y": 385, "font_family": "HYQiHei", "font_size": 20, "font_color": "#47473F", "opacity": 80}
         ]
     },
     14: {
         0: [],
         1: [
-            {"type": "dynamic_text", "value": "212", "x": 280, "y": 610, "font_family": "HFBUBU", "font_size": 18, "font_color": "#47473F", "opacity": 100},
+            {"id": "range", "type": "dynamic_text", "value": "212", "x": 280, "y": 610, "font_family": "HFBUBU", "font_size": 18, "font_color": "#47473F", "opacity": 100},
             {"type": "static_text", "value": "km", "x": 380, "y": 612, "font_family": "HYQiHei", "font_size": 18, "font_color": "#47473F", "opacity": 80},
-            {"type": "progress_bar", "x": 100, "y": 625, "fill_color": "#76B047", "outer_bar_color": "#D3D7D2", "w": 150, "h": 20, "min": 0, "max": 250}
+            {"id": "range_bar", "type": "progress_bar", "x": 100, "y": 625, "fill_color": "#76B047", "outer_bar_color": "#D3D7D2", "w": 150, "h": 20, "min": 0, "max": 250}
         ]
     },
     15: {
         0: [],
         1: [
-            {"type": "dynamic_text", "value": "3.2", "x": 929, "y": 190, "font_family": "HFBUBU", "font_size": 25, "font_color": "#47473F", "opacity": 100},
+            {"id": "nav_distance", "type": "dynamic_text", "value": "3.2", "x": 929, "y": 190, "font_family": "HFBUBU", "font_size": 25, "font_color": "#47473F", "opacity": 100},
             {"type": "static_text", "value": "km", "x": 1035, "y": 210, "font_family": "HYQiHei", "font_size": 15, "font_color": "#47473F", "opacity": 100},
             {"type": "static_text", "value": "MG Road", "x": 930, "y": 260, "font_family": "HYQiHei", "font_size": 20, "font_color": "#94784D", "opacity": 80}
         ]
     },
     16: {
         0: [],
-        1: [{"type": "dynamic_text", "value": "We Don't talk Anymore", "x": 1430, "y": 486, "font_family": "HYQiHei", "font_size": 12, "font_color": "#47473F", "opacity": 100}]
+        1: [{"id": "track_title", "type": "dynamic_text", "value": "We Don't talk Anymore", "x": 1430, "y": 486, "font_family": "HYQiHei", "font_size": 12, "font_color": "#47473F", "opacity": 100}]
     },
     17: {
         0: [],
-        1: [{"type": "dynamic_text", "value": "Charlie Puth", "x": 1564, "y": 525, "font_family": "HYQiHei", "font_size": 10, "font_color": "#94784D", "opacity": 100}]
+        1: [{"id": "track_artist", "type": "dynamic_text", "value": "Charlie Puth", "x": 1564, "y": 525, "font_family": "HYQiHei", "font_size": 10, "font_color": "#94784D", "opacity": 100}]
     },
     18: {
         0: [],
@@ -231,6 +235,319 @@ TELL_TALES = {
         3: [{"type": "image", "file": "TT020_Engine Temp_High_2.png", "zone": 2, "blinking": "NO", "duty_cycle": 0.3, "chime": "engine_check", "chime_type": "twice", "duration": 0}]
     }
 }
+class ElementRecord:
+    """One DECK_GRAPHICS / TELL_TALES element with defaults applied and its screen position resolved"""
+    __slots__ = ("index", "element_id", "type", "x", "y", "w", "h", "file", "value", "font_family", "font_size",
+                 "font_color", "opacity", "fill_color", "outer_bar_color", "minimum", "maximum",
+                 "zone", "blinking", "duty_cycle", "chime", "chime_type", "duration")
+
+    def __init__(self, index, elem, x, y, element_id):
+        self.index = index
+        self.element_id = element_id
+        self.type = elem["type"]
+        self.x = x
+        self.y = y
+        self.w = elem.get("w", 0)
+        self.h = elem.get("h", 0)
+        self.file = elem.get("file")
+        self.value = elem.get("value", "")
+        self.font_family = elem.get("font_family", "Arial")
+        self.font_size = elem.get("font_size", 20)
+        self.font_color = elem.get("font_color", "#000")
+        self.opacity = elem.get("opacity", 100)
+        self.fill_color = elem.get("fill_color", "#76B047")
+        self.outer_bar_color = elem.get("outer_bar_color", "#D3D7D2")
+        self.minimum = elem.get("min", 0)
+        self.maximum = elem.get("max", 250)
+        self.zone = elem.get("zone", 1)
+        self.blinking = elem.get("blinking", "NO") == "YES"
+        self.duty_cycle = elem.get("duty_cycle", 0.5)
+        self.chime = elem.get("chime", None)
+        self.chime_type = elem.get("chime_type", "once")
+        self.duration = elem.get("duration", 5)
+
+class CardRecord:
+    """Compiled card: its element records plus the indices the runtime looks up by type"""
+    __slots__ = ("deck_num", "card_num", "elements", "dynamic_text", "progress_bars", "telltale")
+
+    def __init__(self, deck_num, card_num, elements=()):
+        self.deck_num = deck_num
+        self.card_num = card_num
+        self.elements = tuple(elements)  # One ui item is built per record, in this order
+        self.dynamic_text = tuple(e.index for e in self.elements if e.type == "dynamic_text")
+        self.progress_bars = tuple(e.index for e in self.elements if e.type == "progress_bar")
+        # Zone, blink and chime parameters of a telltale card come from its first image
+        self.telltale = next((e for e in self.elements if e.type == "image"), None)
+
+class CompiledConfig:
+    """Indexed view of DECK_GRAPHICS and TELL_TALES built once by compile_config()"""
+    __slots__ = ("decks", "element_ids", "max_deck", "max_telltale_deck")
+
+    def __init__(self, decks, max_deck, max_telltale_deck):
+        self.decks = decks  # deck_num: tuple of CardRecord indexed by card_num
+        self.max_deck = max_deck
+        self.max_telltale_deck = max_telltale_deck
+        # element_id: (deck_num, card_num, ElementRecord) of every element send_element can update
+        self.element_ids = {}
+        for deck_num, cards in decks.items():
+            if self.is_telltale_deck(deck_num):
+                continue
+            for card in cards:
+                for elem in card.elements:
+                    if elem.type not in UPDATABLE_TYPES:
+                        continue
+                    if elem.element_id in self.element_ids:
+                        raise ValueError(f"Duplicate element id: {elem.element_id}")
+                    self.element_ids[elem.element_id] = (deck_num, card.card_num, elem)
+
+    def is_telltale_deck(self, deck_num):
+        return 50 <= deck_num <= self.max_telltale_deck
+
+    def card(self, deck_num, card_num):
+        cards = self.decks.get(deck_num)
+        if cards is not None and 0 <= card_num < len(cards):
+            return cards[card_num]
+        return CardRecord(deck_num, card_num)
+
+ELEMENT_TYPES = ("image", "dynamic_text", "static_text", "progress_bar")
+UPDATABLE_TYPES = ("dynamic_text", "progress_bar")  # Addressable by element id on regular decks
+
+def _element_id(deck_num, card_num, index, elem):
+    """Explicit "id" from the config, else a positional "deck.card.index" id"""
+    return elem.get("id", f"{deck_num}.{card_num}.{index}")
+
+def compile_config(deck_graphics=DECK_GRAPHICS, tell_tales=TELL_TALES, card_length=DEFAULT_CARD_LENGTH):
+    """Flatten the nested deck/telltale dictionaries into CardRecords indexed by deck and card"""
+    decks = {}
+    for deck_num, cards in deck_graphics.items():
+        records = []
+        for card_num in range(max([card_length] + list(cards.keys())) + 1):
+            elements = [e for e in cards.get(card_num, []) if e["type"] in ELEMENT_TYPES]
+            records.append(CardRecord(deck_num, card_num, [
+                ElementRecord(index, elem, elem.get("x", 0), elem.get("y", 0),
+                              _element_id(deck_num, card_num, index, elem))
+                for index, elem in enumerate(elements)
+            ]))
+        decks[deck_num] = tuple(records)
+    for deck_num, cards in tell_tales.items():
+        records = []
+        for card_num in range(max([card_length] + list(cards.keys())) + 1):
+            # Telltales only draw images, positioned by zone instead of direct x,y
+            elements = [e for e in cards.get(card_num, []) if e["type"] == "image"]
+            element_records = []
+            for index, elem in enumerate(elements):
+                zone_coords = ZONE_COORDINATES.get(elem.get("zone", 1), {"x": 0, "y": 0})
+                element_records.append(ElementRecord(index, elem, zone_coords["x"], zone_coords["y"],
+                                                     _element_id(deck_num, card_num, index, elem)))
+            records.append(CardRecord(deck_num, card_num, element_records))
+        decks[deck_num] = tuple(records)
+    return CompiledConfig(decks, max(deck_graphics.keys()), max(tell_tales.keys()))
+
+COMPILED_CONFIG = compile_config()
+
+def required_assets(config=COMPILED_CONFIG):
+    """(file, scale, transform) of every image the cards draw, as asset_pack.py packs them"""
+    assets = []
+    for deck_num, cards in config.decks.items():
+        for card in cards:
+            for elem in card.elements:
+                if elem.type != "image":
+                    continue
+                if config.is_telltale_deck(deck_num):
+                    assets.append((elem.file, TELLTALE_SCALE, Qt.SmoothTransformation))
+                else:
+                    assets.append((elem.file, 1.0, Qt.FastTransformation))
+    return assets
+
+class PixmapCache:
+    """Process-wide LRU cache of decoded pixmaps keyed by (file, scale, transform)"""
+    def __init__(self, budget_bytes=PIXMAP_CACHE_BUDGET, pack=None):
+        self.budget_bytes = budget_bytes
+        self.pack = pack  # Optional AssetPack consulted before decoding a PNG
+        self.pack_hits = 0
+        self.load_seconds = 0.0  # Time spent decoding and scaling on misses
+        self.entries = OrderedDict()  # (file, scale, transform): QPixmap, oldest first
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, file, scale=1.0, transform=Qt.FastTransformation):
+        """Return the pixmap for an image in IMAGE_DIR, decoding and scaling it only on a miss"""
+        key = (file, scale, int(transform))
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = self.load(file, scale, transform)
+        if pixmap.isNull():
+            return pixmap  # Missing or unreadable file, not worth caching
+        self.entries[key] = pixmap
+        self.used_bytes += self.pixmap_bytes(pixmap)
+        self.evict()
+        return pixmap
+
+    def load(self, file, scale=1.0, transform=Qt.FastTransformation):
+        """Decode and scale an image without caching it"""
+        start = time.perf_counter()
+        image = self.pack.image(file, scale) if self.pack else None
+        if image is not None:
+            # Already decoded, scaled and premultiplied: only the pixels are copied into the pixmap
+            self.pack_hits += 1
+            pixmap = QPixmap.fromImage(image, Qt.NoFormatConversion)
+        else:
+            pixmap = QPixmap(os.path.join(IMAGE_DIR, file))
+            if scale != 1.0 and not pixmap.isNull():
+                pixmap = pixmap.scaled(int(pixmap.width() * scale), int(pixmap.height() * scale),
+                                       Qt.KeepAspectRatio, transform)
+        self.load_seconds += time.perf_counter() - start
+        return pixmap
+
+    def size(self, file, scale=1.0):
+        """Size of an image as drawn at scale, read from the pack index or the PNG header without decoding"""
+        entry = self.pack.index.get(asset_key(file, scale)) if self.pack else None
+        if entry is not None:
+            return QSize(entry["width"], entry["height"])
+        size = QImageReader(os.path.join(IMAGE_DIR, file)).size()
+        if size.isValid() and scale != 1.0:
+            size = QSize(int(size.width() * scale), int(size.height() * scale))
+        return size
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def evict(self):
+        """Drop least recently used pixmaps until the cache fits its budget (always keeps the newest)"""
+        while self.used_bytes > self.budget_bytes and len(self.entries) > 1:
+            _, pixmap = self.entries.popitem(last=False)
+            self.used_bytes -= self.pixmap_bytes(pixmap)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "pack_hits": self.pack_hits,
+            "load_ms": self.load_seconds * 1000,
+            "evictions": self.evictions
+        }
+
+def load_asset_pack(path=ASSET_PACK_PATH):
+    """Map the pre-decoded asset pack if one has been built; cards fall back to the PNGs otherwise"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return AssetPack(path, IMAGE_DIR)
+    except (OSError, ValueError) as e:
+        logger.error(f"Ignoring asset pack {path}: {e}")
+        return None
+
+# Shared by CardWidget and TellTaleWidget (pixmaps are implicitly shared, so eviction is safe)
+PIXMAP_CACHE = PixmapCache(pack=load_asset_pack())
+
+class IconAtlas:
+    """Telltale icons and small deck images packed into a few texture_atlas sheets, built on first use"""
+    def __init__(self, max_icon=ATLAS_MAX_ICON):
+        self.max_icon = max_icon
+        self.atlas = None
+
+    def sprite(self, file, scale=1.0):
+        """(sheet pixmap, source rect) of an image as drawn at scale, or None if it is not in the atlas"""
+        if self.atlas is None:
+            self.build()
+        return self.atlas.sprite(asset_key(file, scale))
+
+    def build(self):
+        images = {}
+        for file, scale, transform in required_assets():
+            key = asset_key(file, scale)
+            if key in images:
+                continue
+            # Sized before decoding: backgrounds and other large images never get loaded here
+            size = PIXMAP_CACHE.size(file, scale)
+            if not size.isValid() or size.width() > self.max_icon or size.height() > self.max_icon:
+                continue
+            pixmap = PIXMAP_CACHE.load(file, scale, transform)
+            if not pixmap.isNull():
+                images[key] = pixmap.toImage()
+        self.atlas = build_atlas(images)
+        logger.info(f"Icon atlas built: {self.atlas.stats()}")
+
+# Sprites for the scene renderer; the widget renderer keeps one pixmap per QLabel
+ICON_ATLAS = IconAtlas()
+
+class BlinkClock:
+    """Drives every blinking telltale label from one timer and one monotonic phase, so they blink in step"""
+    def __init__(self, period_ms=BLINK_PERIOD_MS):
+        self.period_ms = period_ms
+        self.labels = {}  # label: [on_time_ms, visible]
+        self.epoch = time.monotonic()
+        self.timer = None  # Created on first use, once a QApplication exists
+        self.ticks = 0
+
+    def register(self, label, duty_cycle):
+        """Blink label: visible for the first duty_cycle fraction of each shared period"""
+        self.labels[label] = [int(self.period_ms * duty_cycle), None]
+        self.apply()
+        self.schedule()
+
+    def unregister(self, label):
+        self.labels.pop(label, None)
+        if not self.labels and self.timer:
+            self.timer.stop()
+
+    def phase_ms(self):
+        return int((time.monotonic() - self.epoch) * 1000) % self.period_ms
+
+    def apply(self):
+        """Show/hide every label whose state differs from the current phase; Qt merges the updates into one repaint"""
+        phase = self.phase_ms()
+        for label, state in list(self.labels.items()):
+            visible = phase < state[0]
+            if visible != state[1]:
+                state[1] = visible
+                try:
+                    if visible:
+                        label.show()
+                    else:
+                        label.hide()
+                    TRACE.emit(BLINK_TOGGLE, len(self.labels), 0, visible)
+                except RuntimeError:  # Deleted along with a window that was closed without stop_telltale
+                    del self.labels[label]
+
+    def schedule(self):
+        """Sleep until the next on/off edge of any registered label"""
+        if not self.labels:
+            return
+        phase = self.phase_ms()
+        next_edge = min([on_time for on_time, _ in self.labels.values() if on_time > phase] + [self.period_ms])
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.setTimerType(Qt.PreciseTimer)
+            self.timer.timeout.connect(self.tick)
+        self.timer.start(max(1, next_edge - phase))
+
+    def tick(self):
+        self.ticks += 1
+        self.apply()
+        self.schedule()
+
+BLINK_CLOCK = BlinkClock()
+
+# Chimes are decoded to PCM once and shared by every telltale
+CHIME_BANK = ChimeBank(CHIME_FILES, CHIMES_DIR, CHIME_PRIORITIES)
+
 '''
 # --- Update TELL_TALES durations for chime_type ---
 def _patch_telltale_durations():
@@ -244,143 +561,57 @@ def _patch_telltale_durations():
                         elem["duration"] = -1
 _patch_telltale_durations()
 '''
-class TellTaleWidget(QWidget):
-    def __init__(self, deck_num, card_num, elements):
-        super().__init__()
-        self.deck_num = deck_num
-        self.card_num = card_num
-        self.setFixedSize(*BG_RESOLUTION)
-        self.elements = elements
-        self.ui_items = []
-        self.blink_timers = []
-        self.chime_player = None
+class TellTaleBehaviour:
+    """Blinking, chime and duration handling shared by TellTaleWidget and SceneTellTaleCard"""
+    def init_telltale_state(self):
+        self.blink_labels = []
+        self.chime_name = None
+        self.chime_voice = None  # Voice most recently started on CHIME_BANK
         self.chime_timer = None
         self.duration_timer = None
-        self.chime_play_count = 0
         self.chime_type = None
         self.duration = 5  # Default 5 seconds
-        self.init_ui()
 
-    def init_ui(self):
-        for elem in self.elements:
-            if elem["type"] == "image":
-                img_path = os.path.join(IMAGE_DIR, elem["file"])
-                label = QLabel(self)
-                if os.path.exists(img_path):
-                    pixmap = QPixmap(img_path)
-                    # Scale image to half size for telltales
-                    scaled_pixmap = pixmap.scaled(pixmap.width() // 2, pixmap.height() // 2, 
-                                                 Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    label.setPixmap(scaled_pixmap)
-                else:
-                    label.setText(f"Missing: {elem['file']}")
-                    label.setStyleSheet("color: red; background: white;")
-                
-                # Use zone coordinates instead of direct x,y
-                zone = elem.get("zone", 1)
-                zone_coords = ZONE_COORDINATES.get(zone, {"x": 0, "y": 0})
-                label.move(zone_coords["x"], zone_coords["y"])
-                label.show()
-                self.ui_items.append(label)
-                
-                # Setup blinking if enabled
-                blinking = elem.get("blinking", "NO")
-                duty_cycle = elem.get("duty_cycle", 0.5)
-                if blinking == "YES" and duty_cycle > 0:
-                    self.setup_blinking(label, duty_cycle)
-                
-                # Setup chime if specified
-                chime = elem.get("chime", None)
-                chime_type = elem.get("chime_type", "once")
-                if chime and chime in CHIME_FILES:
-                    self.setup_chime(chime, chime_type)
-                
-                # Setup duration
-                duration = elem.get("duration", 5)
-                self.duration = duration
-                # Only start duration timer if duration > 0
-                if duration > 0:  # 0 or -1 means no auto-deactivation
-                    self.setup_duration_timer()
+    def setup_telltale_element(self, elem, label):
+        """Start blinking, chime and duration handling for a telltale image ElementRecord"""
+        # Setup blinking if enabled
+        if elem.blinking and elem.duty_cycle > 0:
+            self.setup_blinking(label, elem.duty_cycle)
+        
+        # Setup chime if specified
+        if elem.chime and elem.chime in CHIME_FILES:
+            self.setup_chime(elem.chime, elem.chime_type)
+        
+        # Setup duration
+        self.duration = elem.duration
+        # Only start duration timer if duration > 0
+        if elem.duration > 0:  # 0 or -1 means no auto-deactivation
+            self.setup_duration_timer()
 
     def setup_blinking(self, label, duty_cycle):
-        """Setup blinking timer for a label"""
-        # Calculate on/off times based on duty cycle
-        cycle_time = 1000  # 1 second total cycle
-        on_time = int(cycle_time * duty_cycle)
-        off_time = cycle_time - on_time
-        
-        # Create timer for blinking
-        timer = QTimer()
-        timer.timeout.connect(lambda: self.toggle_label_visibility(label))
-        timer.start(on_time)  # Start with on time
-        self.blink_timers.append((timer, label, on_time, off_time))
+        """Hand the label to the shared blink clock"""
+        BLINK_CLOCK.register(label, duty_cycle)
+        self.blink_labels.append(label)
 
     def setup_chime(self, chime_name, chime_type):
-        """Setup chime player for this telltale"""
-        chime_file = CHIME_FILES.get(chime_name)
-        if chime_file:
-            chime_path = os.path.join(CHIMES_DIR, chime_file)
-            if os.path.exists(chime_path):
-                # Create a new media player for this telltale
-                self.chime_player = QMediaPlayer()
-                self.chime_player.setMedia(QMediaContent(QUrl.fromLocalFile(chime_path)))
-                self.chime_type = chime_type
-                self.chime_play_count = 0
-                # Connect error handling
-                self.chime_player.error.connect(self.on_chime_error)
-                self.chime_player.mediaStatusChanged.connect(self.on_chime_status_changed)
-                # Set volume to ensure audio is audible
-                self.chime_player.setVolume(50)
-                # Do NOT play chime here! Only configure.
-            else:
-                logger.error(f"Chime file not found: {chime_path}")
-
-    def on_chime_error(self, error):
-        """Handle chime player errors"""
-        error_messages = {
-            QMediaPlayer.NoError: "No Error",
-            QMediaPlayer.ResourceError: "Resource Error",
-            QMediaPlayer.NetworkError: "Network Error",
-            QMediaPlayer.FormatError: "Format Error",
-            QMediaPlayer.AccessDeniedError: "Access Denied Error"
-        }
-        error_msg = error_messages.get(error, f"Unknown Error ({error})")
-        logger.error(f"Chime player error - Deck: {self.deck_num}, Card: {self.card_num}, Error: {error_msg}")
-
-    def on_chime_status_changed(self, status):
-        """Handle chime status changes for twice playback"""
-        status_messages = {
-            QMediaPlayer.UnknownMediaStatus: "Unknown",
-            QMediaPlayer.NoMedia: "No Media",
-            QMediaPlayer.LoadingMedia: "Loading",
-            QMediaPlayer.LoadedMedia: "Loaded",
-            QMediaPlayer.BufferingMedia: "Buffering",
-            QMediaPlayer.BufferedMedia: "Buffered",
-            QMediaPlayer.StalledMedia: "Stalled",
-            QMediaPlayer.EndOfMedia: "End of Media",
-            QMediaPlayer.InvalidMedia: "Invalid Media"
-        }
-        status_msg = status_messages.get(status, f"Unknown Status ({status})")
-        logger.debug(f"Chime status changed - Deck: {self.deck_num}, Card: {self.card_num}, Status: {status_msg}")
-        
-        if status == QMediaPlayer.EndOfMedia and self.chime_type == "twice" and self.chime_play_count < 2:
-            self.chime_play_count += 1
-            if self.chime_play_count < 2:
-                # Add delay before second play
-                QTimer.singleShot(800, self.play_chime_twice)
-                logger.info(f"Chime second play scheduled - Deck: {self.deck_num}, Card: {self.card_num}, Play Count: {self.chime_play_count}")
+        """Setup chime for this telltale; the PCM itself lives in CHIME_BANK"""
+        if CHIME_BANK.has(chime_name):
+            self.chime_name = chime_name
+            self.chime_type = chime_type
+            # Do NOT play chime here! Only configure.
+        else:
+            logger.error(f"Chime file not found: {CHIME_BANK.path(chime_name)}")
 
     def trigger_chime(self):
         """Explicitly play the chime based on its type. Call this on telltale activation."""
-        if not self.chime_player or not self.chime_type:
+        if not self.chime_name or not self.chime_type:
             return
-        # Reset play count for each activation
-        self.chime_play_count = 0
+        # Chimes play from decoded PCM, so there is no load delay to wait out
         if self.chime_type == "once":
-            QTimer.singleShot(200, self.play_chime_once)
+            self.play_chime_once()
             logger.info(f"Chime triggered (once) - Deck: {self.deck_num}, Card: {self.card_num}")
         elif self.chime_type == "twice":
-            QTimer.singleShot(200, self.play_chime_twice)
+            self.play_chime_twice()
             logger.info(f"Chime triggered (twice) - Deck: {self.deck_num}, Card: {self.card_num}")
         elif self.chime_type == "continuous":
             if self.duration == -1:
@@ -389,7 +620,7 @@ class TellTaleWidget(QWidget):
                     self.chime_timer = QTimer()
                     self.chime_timer.timeout.connect(self.play_chime)
                     self.chime_timer.start(3000)  # Play chime every 3 seconds
-                QTimer.singleShot(200, self.play_chime)
+                self.play_chime()
                 logger.info(f"Chime triggered (continuous, infinite) - Deck: {self.deck_num}, Card: {self.card_num}")
             elif self.duration > 0:
                 # Play for duration seconds, then stop
@@ -397,7 +628,7 @@ class TellTaleWidget(QWidget):
                     self.chime_timer = QTimer()
                     self.chime_timer.timeout.connect(self.play_chime)
                     self.chime_timer.start(3000)
-                QTimer.singleShot(200, self.play_chime)
+                self.play_chime()
                 # Start a timer to stop after duration
                 if self.duration_timer:
                     self.duration_timer.stop()
@@ -407,42 +638,35 @@ class TellTaleWidget(QWidget):
                 self.duration_timer.start(self.duration * 1000)
                 logger.info(f"Chime triggered (continuous, timed {self.duration}s) - Deck: {self.deck_num}, Card: {self.card_num}")
 
+    def start_chime_voice(self, repeats=1):
+        CHIME_BANK.stop(self.chime_voice)
+        self.chime_voice = CHIME_BANK.play(self.chime_name, self.chime_type, repeats)
+
+    def stop_chime_voice(self):
+        CHIME_BANK.stop(self.chime_voice)
+        self.chime_voice = None
+
     def play_chime_once(self):
-        if self.chime_player:
-            self.chime_player.stop()
-            self.chime_player.setPosition(0)
-            self.chime_player.play()
+        if self.chime_name:
+            self.start_chime_voice()
             logger.info(f"Chime started ONCE - Deck: {self.deck_num}, Card: {self.card_num}")
 
     def play_chime_twice(self):
-        if self.chime_player:
-            self.chime_player.stop()
-            self.chime_player.setPosition(0)
-            self.chime_player.play()
-            logger.info(f"Chime started TWICE (first) - Deck: {self.deck_num}, Card: {self.card_num}")
-            # Schedule second play after audio ends or fixed delay (e.g., 1s)
-            QTimer.singleShot(1200, self._play_chime_twice_second)
-
-    def _play_chime_twice_second(self):
-        if self.chime_player:
-            self.chime_player.stop()
-            self.chime_player.setPosition(0)
-            self.chime_player.play()
-            logger.info(f"Chime started TWICE (second) - Deck: {self.deck_num}, Card: {self.card_num}")
+        if self.chime_name:
+            # The mixer repeats the voice itself once the first play ends
+            self.start_chime_voice(repeats=2)
+            logger.info(f"Chime started TWICE - Deck: {self.deck_num}, Card: {self.card_num}")
 
     def play_chime(self):
-        if self.chime_player:
-            self.chime_player.stop()
-            self.chime_player.setPosition(0)
-            self.chime_player.play()
+        if self.chime_name:
+            self.start_chime_voice()
             logger.info(f"Chime started (continuous) - Deck: {self.deck_num}, Card: {self.card_num}")
 
     def stop_continuous_chime(self):
         if self.chime_timer:
             self.chime_timer.stop()
             self.chime_timer = None
-        if self.chime_player:
-            self.chime_player.stop()
+        self.stop_chime_voice()
         logger.info(f"Chime stopped (continuous, timed) - Deck: {self.deck_num}, Card: {self.card_num}")
 
     def setup_duration_timer(self):
@@ -459,27 +683,14 @@ class TellTaleWidget(QWidget):
         # For now, we'll just stop the timers
         if self.chime_timer:
             self.chime_timer.stop()
-        if self.chime_player:
-            self.chime_player.stop()
-
-    def toggle_label_visibility(self, label):
-        """Toggle label visibility for blinking effect"""
-        for timer, lbl, on_time, off_time in self.blink_timers:
-            if lbl == label:
-                if label.isVisible():
-                    label.hide()
-                    timer.setInterval(off_time)
-                else:
-                    label.show()
-                    timer.setInterval(on_time)
-                break
-
-    def clear_ui(self):
-
-        # Stop all blink timers
-        for timer, _, _, _ in self.blink_timers:
-            timer.stop()
-        self.blink_timers.clear()
+        self.stop_chime_voice()
+
+    def stop_telltale(self):
+        """Stop blink/chime/duration timers and any chime playback"""
+        # Stop blinking
+        for label in self.blink_labels:
+            BLINK_CLOCK.unregister(label)
+        self.blink_labels.clear()
         
         # Stop chime timer if continuous
         if self.chime_timer:
@@ -491,38 +702,83 @@ class TellTaleWidget(QWidget):
             self.duration_timer = None
         
         # Stop chime playback
-        if self.chime_player:
-            self.chime_player.stop()
+        if self.chime_name:
+            self.stop_chime_voice()
             logger.info(f"Chime stopped (clear_ui) - Deck: {self.deck_num}, Card: {self.card_num}")
+
+class TellTaleWidget(TellTaleBehaviour, QWidget):
+    def __init__(self, deck_num, card_num, elements):
+        super().__init__()
+        self.deck_num = deck_num
+        self.card_num = card_num
+        self.setFixedSize(*BG_RESOLUTION)
+        self.elements = elements
+        self.ui_items = []
+        self.init_telltale_state()
+        self.init_ui()
+
+    @OPERATIONS.timed("TellTaleWidget.init_ui")
+    def init_ui(self):
+        for elem in self.elements:
+            if elem.type == "image":
+                label = QLabel(self)
+                # Scale image to half size for telltales
+                pixmap = PIXMAP_CACHE.get(elem.file, TELLTALE_SCALE, Qt.SmoothTransformation)
+                if not pixmap.isNull():
+                    label.setPixmap(pixmap)
+                else:
+                    label.setText(f"Missing: {elem.file}")
+                    label.setStyleSheet("color: red; background: white;")
+                
+                # Zone coordinates are resolved into x,y by compile_config
+                label.move(elem.x, elem.y)
+                label.show()
+                self.ui_items.append(label)
+                self.setup_telltale_element(elem, label)
+
+    @OPERATIONS.timed("TellTaleWidget.clear_ui")
+    def clear_ui(self):
+        self.stop_telltale()
         for item in self.ui_items:
             item.hide()
             item.deleteLater()
         self.ui_items = []
 
 class TellTaleDeckWidget(QWidget):
-    def __init__(self, deck_num, card_length=DEFAULT_CARD_LENGTH):
+    def __init__(self, deck_num, card_length=DEFAULT_CARD_LENGTH, lazy=False):
         super().__init__()
         self.deck_num = deck_num
         self.card_length = card_length
+        self.lazy = lazy
         self.setFixedSize(*BG_RESOLUTION)
-        self.cards = []
+        self.cards = [None] * (card_length + 1)  # 0 to card_length, None until built
         self.active_card = 0
-        for card_num in range(card_length + 1):  # 0 to card_length
-            elements = TELL_TALES.get(deck_num, {}).get(card_num, [])
-            card = TellTaleWidget(deck_num, card_num, elements)
+        if not lazy:
+            for card_num in range(card_length + 1):
+                self.get_card(card_num)
+            self.show_card(0)
+
+    def get_card(self, card_num):
+        """Return the telltale card widget, building it on first use"""
+        card = self.cards[card_num]
+        if card is None:
+            elements = COMPILED_CONFIG.card(self.deck_num, card_num).elements
+            card = TellTaleWidget(self.deck_num, card_num, elements)
             card.hide()
-            self.cards.append(card)
             card.setParent(self)
-        self.show_card(0)
+            self.cards[card_num] = card
+        return card
 
     def show_card(self, card_num):
         # Hide all cards except the highest active one
         for i, card in enumerate(self.cards):
-            card.hide()
+            if card is not None:
+                card.hide()
+        card = self.get_card(card_num)
         # Re-initialize UI if needed (after clear_ui)
-        if hasattr(self.cards[card_num], 'ui_items') and not self.cards[card_num].ui_items:
-            self.cards[card_num].init_ui()
-        self.cards[card_num].show()
+        if hasattr(card, 'ui_items') and not card.ui_items:
+            card.init_ui()
+        card.show()
         self.active_card = card_num
 
     def activate_card(self, card_num):
@@ -532,13 +788,18 @@ class TellTaleDeckWidget(QWidget):
         # If deactivating the highest active card, show next lower active card
         if self.active_card == card_num:
             for i in range(card_num - 1, -1, -1):
-                if self.cards[i].isVisible():
+                if self.cards[i] is not None and self.cards[i].isVisible():
                     self.show_card(i)
                     self.cards[card_num].clear_ui()  # Stop chimes/timers for deactivated card
                     return
             self.show_card(0)
             self.cards[card_num].clear_ui()  # Stop chimes/timers for deactivated card
 
+def register_element_handles(handles, card):
+    """Record a freshly built card's ui items; they line up one to one with its compiled elements"""
+    for index, item in enumerate(card.ui_items):
+        handles[(card.deck_num, card.card_num, index)] = item
+
 class CardWidget(QWidget):
     def __init__(self, deck_num, card_num, elements):
         super().__init__()
@@ -549,52 +810,53 @@ class CardWidget(QWidget):
         self.ui_items = []
         self.init_ui()
 
+    @OPERATIONS.timed("CardWidget.init_ui")
     def init_ui(self):
         for elem in self.elements:
-            if elem["type"] == "image":
-                img_path = os.path.join(IMAGE_DIR, elem["file"])
+            if elem.type == "image":
                 label = QLabel(self)
-                if os.path.exists(img_path):
-                    pixmap = QPixmap(img_path)
+                pixmap = PIXMAP_CACHE.get(elem.file)
+                if not pixmap.isNull():
                     label.setPixmap(pixmap)
                 else:
-                    label.setText(f"Missing: {elem['file']}")
+                    label.setText(f"Missing: {elem.file}")
                     label.setStyleSheet("color: red; background: white;")
-                label.move(elem["x"], elem["y"])
+                label.move(elem.x, elem.y)
                 label.show()
                 self.ui_items.append(label)
-            elif elem["type"] == "dynamic_text" or elem["type"] == "static_text":
+            elif elem.type == "dynamic_text" or elem.type == "static_text":
                 label = QLabel(self)
-                label.setText(elem["value"])
-                label.setFont(QFont(elem.get("font_family", "Arial"), elem.get("font_size", 20)))
-                label.setStyleSheet(f"color: {elem.get('font_color', '#000')};")
-                label.move(elem["x"], elem["y"])
+                label.setText(elem.value)
+                label.setFont(QFont(elem.font_family, elem.font_size))
+                label.setStyleSheet(f"color: {elem.font_color};")
+                label.move(elem.x, elem.y)
                 label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                label.setWindowOpacity(elem.get("opacity", 100) / 100.0)
+                label.setWindowOpacity(elem.opacity / 100.0)
                 label.show()
                 self.ui_items.append(label)
-            elif elem["type"] == "progress_bar":
+            elif elem.type == "progress_bar":
                 bar = QProgressBar(self)
-                bar.setGeometry(elem["x"], elem["y"], elem["w"], elem["h"])
-                bar.setMinimum(0)
-                bar.setMaximum(250)
+                bar.setGeometry(elem.x, elem.y, elem.w, elem.h)
+                bar.setMinimum(elem.minimum)
+                bar.setMaximum(elem.maximum)
                 bar.setValue(212)
                 bar.setTextVisible(False)  # Hide percentage overlay                
                 bar.setStyleSheet(
                     f"""
                     QProgressBar {{
-                        border: 1px solid {elem.get('outer_bar_color', '#D3D7D2')};
+                        border: 1px solid {elem.outer_bar_color};
                         border-radius: 5px;
-                        background: {elem.get('outer_bar_color', '#D3D7D2')};
+                        background: {elem.outer_bar_color};
                     }}
                     QProgressBar::chunk {{
-                        background-color: {elem.get('fill_color', '#76B047')};
+                        background-color: {elem.fill_color};
                     }}
                     """
                 )
                 bar.show()
                 self.ui_items.append(bar)
 
+    @OPERATIONS.timed("CardWidget.clear_ui")
     def clear_ui(self):
         for item in self.ui_items:
             item.hide()
@@ -602,26 +864,329 @@ class CardWidget(QWidget):
         self.ui_items = []
 
 class DeckWidget(QWidget):
-    def __init__(self, deck_num, card_length=DEFAULT_CARD_LENGTH):
+    def __init__(self, deck_num, card_length=DEFAULT_CARD_LENGTH, lazy=False, handles=None):
+        """handles: optional dict filled with (deck_num, card_num, element_index): ui item as cards are built"""
         super().__init__()
         self.deck_num = deck_num
         self.card_length = card_length
+        self.lazy = lazy
+        self.handles = handles
         self.setFixedSize(*BG_RESOLUTION)
-        self.cards = []
+        self.cards = [None] * (card_length + 1)  # 0 to card_length, None until built
         self.active_card = 0
-        for card_num in range(card_length + 1):  # 0 to card_length
-            elements = DECK_GRAPHICS.get(deck_num, {}).get(card_num, [])
-            card = CardWidget(deck_num, card_num, elements)
+        if not lazy:
+            for card_num in range(card_length + 1):
+                self.get_card(card_num)
+            self.show_card(0)
+
+    def get_card(self, card_num):
+        """Return the card widget, building it (and decoding its images) on first use"""
+        card = self.cards[card_num]
+        if card is None:
+            elements = COMPILED_CONFIG.card(self.deck_num, card_num).elements
+            card = CardWidget(self.deck_num, card_num, elements)
             card.hide()
-            self.cards.append(card)
             card.setParent(self)
-        self.show_card(0)
+            self.cards[card_num] = card
+            if self.handles is not None:
+                register_element_handles(self.handles, card)
+        return card
 
     def show_card(self, card_num):
         # Hide all cards except the highest active one
         for i, card in enumerate(self.cards):
-            card.hide()
-        self.cards[card_num].show()
+            if card is not None:
+                card.hide()
+        self.get_card(card_num).show()
+        self.active_card = card_num
+
+    def activate_card(self, card_num):
+        self.show_card(card_num)
+
+    def deactivate_card(self, card_num):
+        # If deactivating the highest active card, show next lower active card
+        if self.active_card == card_num:
+            for i in range(card_num - 1, -1, -1):
+                if self.cards[i] is not None and self.cards[i].isVisible():
+                    self.show_card(i)
+                    return
+            self.show_card(0)
+
+class SceneItem:
+    """A drawable element of a SceneCard; mirrors the QLabel/QProgressBar calls made on card widgets"""
+    def __init__(self, card, x, y, w=0, h=0):
+        self.card = card
+        self.rect = QRect(x, y, w, h)
+        self.visible = True
+
+    def move(self, x, y):
+        old_bounds = self.bounds()
+        self.rect.moveTo(x, y)
+        self.changed(old_bounds)
+
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self.changed()
+
+    def hide(self):
+        if self.visible:
+            self.changed()
+            self.visible = False
+
+    def isVisible(self):
+        return self.visible
+
+    def deleteLater(self):
+        self.hide()
+
+    def bounds(self):
+        """Screen area touched when painting this item"""
+        return QRect(self.rect)
+
+    def changed(self, old_bounds=None):
+        """Invalidate the item's current (and previous) bounds if it is on screen"""
+        if self.visible and self.card.visible:
+            canvas = self.card.canvas
+            canvas.mark_dirty(self.bounds())
+            if old_bounds is not None:
+                canvas.mark_dirty(old_bounds)
+
+    def paint(self, painter):
+        pass
+
+class SceneLabel(SceneItem):
+    """Image or text element painted by the SceneCanvas"""
+    def __init__(self, card, x, y):
+        super().__init__(card, x, y)
+        self.pixmap = None
+        self.source = None  # Sub-rect of pixmap to draw when pixmap is an atlas sheet
+        self.label_text = ""
+        self.font = QFont()
+        self.metrics = QFontMetrics(self.font)
+        self.color = QColor("#000")
+        self.background = None
+        self.opacity = 1.0
+
+    def setPixmap(self, pixmap):
+        old_bounds = self.bounds()
+        self.pixmap = pixmap
+        self.source = None
+        self.rect.setSize(pixmap.size())
+        self.changed(old_bounds)
+
+    def setSprite(self, sheet, source):
+        """Draw the source rect of an atlas sheet instead of a pixmap of its own"""
+        old_bounds = self.bounds()
+        self.pixmap = sheet
+        self.source = source
+        self.rect.setSize(source.size())
+        self.changed(old_bounds)
+
+    def setFont(self, font):
+        self.font = font
+        self.metrics = QFontMetrics(font)
+        self.setText(self.label_text)
+
+    def setText(self, text):
+        old_bounds = self.bounds()
+        self.label_text = text
+        if self.pixmap is None:
+            self.rect.setSize(self.metrics.size(Qt.TextSingleLine, text))
+        self.changed(old_bounds)
+
+    def text(self):
+        return self.label_text
+
+    def bounds(self):
+        if self.pixmap is None:
+            return self.rect.adjusted(-2, -2, 2, 2)  # Glyph bearings can overhang the metrics box
+        return QRect(self.rect)
+
+    def paint(self, painter):
+        painter.setOpacity(self.opacity)
+        if self.source is not None:
+            painter.drawPixmap(self.rect.topLeft(), self.pixmap, self.source)
+        elif self.pixmap is not None:
+            painter.drawPixmap(self.rect.topLeft(), self.pixmap)
+        else:
+            if self.background is not None:
+                painter.fillRect(self.rect, self.background)
+            painter.setFont(self.font)
+            painter.setPen(self.color)
+            painter.drawText(self.rect, Qt.AlignLeft | Qt.AlignVCenter, self.label_text)
+        painter.setOpacity(1.0)
+
+class SceneProgressBar(SceneItem):
+    """Progress bar element painted by the SceneCanvas"""
+    def __init__(self, card, elem):
+        super().__init__(card, elem.x, elem.y, elem.w, elem.h)
+        self.minimum = elem.minimum
+        self.maximum = elem.maximum
+        self.bar_value = 212
+        self.fill_color = QColor(elem.fill_color)
+        self.outer_bar_color = QColor(elem.outer_bar_color)
+
+    def setValue(self, value):
+        value = int(value)
+        if self.minimum <= value <= self.maximum:  # Out of range values are ignored, as QProgressBar does
+            self.bar_value = value
+            self.changed()
+
+    def value(self):
+        return self.bar_value
+
+    def paint(self, painter):
+        painter.setPen(self.outer_bar_color)
+        painter.setBrush(self.outer_bar_color)
+        painter.drawRoundedRect(self.rect.adjusted(0, 0, -1, -1), 5, 5)
+        span = self.maximum - self.minimum
+        fill_width = self.rect.width() * (self.bar_value - self.minimum) // span if span > 0 else 0
+        if fill_width > 0:
+            chunk = QRect(self.rect.x() + 1, self.rect.y() + 1, fill_width - 2, self.rect.height() - 2)
+            painter.fillRect(chunk, self.fill_color)
+        painter.setBrush(Qt.NoBrush)
+
+class SceneCard:
+    """Non-widget counterpart of CardWidget; its elements are painted by the owning SceneCanvas"""
+    def __init__(self, canvas, deck_num, card_num, elements):
+        self.canvas = canvas
+        self.deck_num = deck_num
+        self.card_num = card_num
+        self.elements = elements
+        self.ui_items = []
+        self.visible = False
+        self.init_ui()
+
+    @OPERATIONS.timed("SceneCard.init_ui")
+    def init_ui(self):
+        for elem in self.elements:
+            if elem.type == "image":
+                label = SceneLabel(self, elem.x, elem.y)
+                sprite = ICON_ATLAS.sprite(elem.file)
+                pixmap = PIXMAP_CACHE.get(elem.file) if sprite is None else None
+                if sprite is not None:
+                    label.setSprite(*sprite)
+                elif not pixmap.isNull():
+                    label.setPixmap(pixmap)
+                else:
+                    label.color = QColor("red")
+                    label.background = QColor("white")
+                    label.setText(f"Missing: {elem.file}")
+                self.ui_items.append(label)
+            elif elem.type == "dynamic_text" or elem.type == "static_text":
+                label = SceneLabel(self, elem.x, elem.y)
+                label.setFont(QFont(elem.font_family, elem.font_size))
+                label.color = QColor(elem.font_color)
+                label.opacity = elem.opacity / 100.0
+                label.setText(elem.value)
+                self.ui_items.append(label)
+            elif elem.type == "progress_bar":
+                self.ui_items.append(SceneProgressBar(self, elem))
+
+    @OPERATIONS.timed("SceneCard.clear_ui")
+    def clear_ui(self):
+        self.remove_items()
+
+    def remove_items(self):
+        # Untimed, so a subclass's clear_ui is not also counted as SceneCard.clear_ui
+        for item in self.ui_items:
+            item.deleteLater()
+        self.ui_items = []
+
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self.mark_dirty()
+
+    def hide(self):
+        if self.visible:
+            self.mark_dirty()
+            self.visible = False
+
+    def isVisible(self):
+        return self.visible
+
+    def mark_dirty(self):
+        for item in self.ui_items:
+            if item.visible:
+                self.canvas.mark_dirty(item.bounds())
+
+    def paint(self, painter, region):
+        painted = 0
+        for item in self.ui_items:
+            if item.visible and region.intersects(item.bounds()):
+                item.paint(painter)
+                painted += 1
+        return painted
+
+class SceneTellTaleCard(TellTaleBehaviour, SceneCard):
+    """Non-widget counterpart of TellTaleWidget"""
+    def __init__(self, canvas, deck_num, card_num, elements):
+        self.init_telltale_state()
+        super().__init__(canvas, deck_num, card_num, elements)
+
+    @OPERATIONS.timed("SceneTellTaleCard.init_ui")
+    def init_ui(self):
+        for elem in self.elements:
+            if elem.type == "image":
+                # Zone coordinates are resolved into x,y by compile_config
+                label = SceneLabel(self, elem.x, elem.y)
+                # Telltales are drawn from the icon atlas at TELLTALE_SCALE
+                sprite = ICON_ATLAS.sprite(elem.file, TELLTALE_SCALE)
+                pixmap = PIXMAP_CACHE.get(elem.file, TELLTALE_SCALE, Qt.SmoothTransformation) if sprite is None else None
+                if sprite is not None:
+                    label.setSprite(*sprite)
+                elif not pixmap.isNull():
+                    label.setPixmap(pixmap)
+                else:
+                    label.color = QColor("red")
+                    label.background = QColor("white")
+                    label.setText(f"Missing: {elem.file}")
+                self.ui_items.append(label)
+                self.setup_telltale_element(elem, label)
+
+    @OPERATIONS.timed("SceneTellTaleCard.clear_ui")
+    def clear_ui(self):
+        self.stop_telltale()
+        self.remove_items()
+
+class SceneDeck:
+    """Non-widget counterpart of DeckWidget; decks are painted by the canvas in creation (z) order"""
+    card_class = SceneCard
+
+    def __init__(self, canvas, deck_num, card_length=DEFAULT_CARD_LENGTH, lazy=False, handles=None):
+        self.canvas = canvas
+        self.deck_num = deck_num
+        self.card_length = card_length
+        self.lazy = lazy
+        self.handles = handles
+        self.visible = False
+        self.cards = [None] * (card_length + 1)  # 0 to card_length, None until built
+        self.active_card = 0
+        canvas.decks.append(self)
+        if not lazy:
+            for card_num in range(card_length + 1):
+                self.get_card(card_num)
+            self.show_card(0)
+
+    def get_card(self, card_num):
+        """Return the scene card, building it on first use"""
+        card = self.cards[card_num]
+        if card is None:
+            elements = COMPILED_CONFIG.card(self.deck_num, card_num).elements
+            card = self.card_class(self.canvas, self.deck_num, card_num, elements)
+            self.cards[card_num] = card
+            if self.handles is not None:
+                register_element_handles(self.handles, card)
+        return card
+
+    def show_card(self, card_num):
+        # Hide all cards except the highest active one
+        for card in self.cards:
+            if card is not None:
+                card.hide()
+        self.get_card(card_num).show()
         self.active_card = card_num
 
     def activate_card(self, card_num):
@@ -631,38 +1196,180 @@ class DeckWidget(QWidget):
         # If deactivating the highest active card, show next lower active card
         if self.active_card == card_num:
             for i in range(card_num - 1, -1, -1):
-                if self.cards[i].isVisible():
+                if self.cards[i] is not None and self.cards[i].isVisible():
                     self.show_card(i)
                     return
             self.show_card(0)
 
+    def show(self):
+        if not self.visible:
+            self.visible = True
+            self.mark_dirty()
+
+    def hide(self):
+        if self.visible:
+            self.mark_dirty()
+            self.visible = False
+
+    def isVisible(self):
+        return self.visible
+
+    def mark_dirty(self):
+        for card in self.cards:
+            if card is not None and card.visible:
+                card.mark_dirty()
+
+class SceneTellTaleDeck(SceneDeck):
+    """Non-widget counterpart of TellTaleDeckWidget"""
+    card_class = SceneTellTaleCard
+
+    def show_card(self, card_num):
+        for card in self.cards:
+            if card is not None:
+                card.hide()
+        card = self.get_card(card_num)
+        # Re-initialize UI if needed (after clear_ui)
+        if not card.ui_items:
+            card.init_ui()
+        card.show()
+        self.active_card = card_num
+
+    def deactivate_card(self, card_num):
+        if self.active_card == card_num:
+            for i in range(card_num - 1, -1, -1):
+                if self.cards[i] is not None and self.cards[i].isVisible():
+                    self.show_card(i)
+                    self.cards[card_num].clear_ui()  # Stop chimes/timers for deactivated card
+                    return
+            self.show_card(0)
+            self.cards[card_num].clear_ui()  # Stop chimes/timers for deactivated card
+
+class SceneCanvas(QWidget):
+    """Single surface that paints every visible deck's active card in z-order, replacing stacked full-screen widgets"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(*BG_RESOLUTION)
+        self.decks = []  # Bottom-most first, filled by SceneDeck
+        self.frame_count = 0
+        self.frame_stats = deque(maxlen=DIRTY_STATS_WINDOW)  # (dirty_area, dirty_rects, items_painted) per frame
+
+    def mark_dirty(self, rect):
+        """Schedule a repaint of rect; Qt merges all rects marked before the next frame into one paint"""
+        self.update(rect)
+
+    def paintEvent(self, event):
+        region = event.region()
+        painter = QPainter(self)
+        painted = 0
+        for deck in self.decks:
+            if deck.visible:
+                for card in deck.cards:
+                    if card is not None and card.visible:
+                        painted += card.paint(painter, region)
+        painter.end()
+        rects = region.rects()
+        self.frame_count += 1
+        self.frame_stats.append((sum(r.width() * r.height() for r in rects), len(rects), painted))
+
+    def dirty_stats(self):
+        """Dirty-area statistics over the last DIRTY_STATS_WINDOW frames"""
+        if not self.frame_stats:
+            return {"frames": self.frame_count}
+        areas = [area for area, _, _ in self.frame_stats]
+        last_area, last_rects, last_painted = self.frame_stats[-1]
+        return {
+            "frames": self.frame_count,
+            "full_frame_area": self.width() * self.height(),
+            "last_dirty_area": last_area,
+            "last_dirty_rects": last_rects,
+            "last_items_painted": last_painted,
+            "mean_dirty_area": sum(areas) / len(areas),
+            "max_dirty_area": max(areas)
+        }
+
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, lazy=False, warmup=None, renderer="widgets"):
+        """
+        lazy: build card widgets and decode their images only when a card is first activated
+        warmup: optional list of (deck_num, card_num) built right after the event loop starts
+        renderer: "widgets" stacks a full-screen QWidget per deck/card, "scene" paints all of them on one SceneCanvas
+        """
         super().__init__()
+        start = time.perf_counter()
+        self.startup_ms = {}  # Phase: milliseconds spent building it (see benchmark_startup.py)
         self.setWindowTitle("Decks and Cards Demo")
         self.setFixedSize(*BG_RESOLUTION)
+        self.lazy = lazy
+        self.renderer = renderer
+        if renderer == "scene":
+            self.canvas = SceneCanvas(self)
+        elif renderer == "widgets":
+            self.canvas = None
+        else:
+            raise ValueError(f"Unknown renderer: {renderer}")
         self.decks = []
         self.telltale_decks = []
+        self.element_handles = {}  # (deck_num, card_num, element_index): ui item of a regular deck card
         self.active_telltales = []  # List of (deck_num, card_num) tuples
         self.zone_telltales = {}  # zone: [(deck_num, card_num), ...]
         self.zone_timers = {}  # zone: QTimer for each zone
         self.zone_round_robin_data = {}  # zone: {telltales: [], current_index: 0, timing_data: ...}
+        self.pending_activations = []  # (deck_num, card_num, activation_status), in arrival order
+        self.deferred_zones = None  # Zones to re-layout once at the end of commit_frame
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.commit_frame)
         
         # Initialize regular decks
-        for deck_num in range(0, max(DECK_GRAPHICS.keys()) + 1):
-            deck = DeckWidget(deck_num)
-            deck.setParent(self)
-            deck.move(0, 0)
-            deck.hide()
+        for deck_num in range(0, COMPILED_CONFIG.max_deck + 1):
+            if self.canvas:
+                deck = SceneDeck(self.canvas, deck_num, lazy=lazy, handles=self.element_handles)
+            else:
+                deck = DeckWidget(deck_num, lazy=lazy, handles=self.element_handles)
+                deck.setParent(self)
+                deck.move(0, 0)
+                deck.hide()
             self.decks.append(deck)
+        decks_done = time.perf_counter()
+        self.startup_ms["decks"] = (decks_done - start) * 1000
             
         # Initialize telltale decks
-        for deck_num in range(50, max(TELL_TALES.keys()) + 1):
-            deck = TellTaleDeckWidget(deck_num)
-            deck.setParent(self)
-            deck.move(0, 0)
-            deck.hide()
+        for deck_num in range(50, COMPILED_CONFIG.max_telltale_deck + 1):
+            if self.canvas:
+                deck = SceneTellTaleDeck(self.canvas, deck_num, lazy=lazy)
+            else:
+                deck = TellTaleDeckWidget(deck_num, lazy=lazy)
+                deck.setParent(self)
+                deck.move(0, 0)
+                deck.hide()
             self.telltale_decks.append(deck)
+        self.startup_ms["telltale_decks"] = (time.perf_counter() - decks_done) * 1000
+
+        # Decode chimes to PCM once the first frame is out of the way
+        QTimer.singleShot(0, CHIME_BANK.preload)
+
+        # Warm up selected cards once the first frame is out of the way
+        if warmup:
+            QTimer.singleShot(0, lambda cards=list(warmup): self.warm_up(cards))
+
+    def warm_up(self, cards):
+        """Build the widgets for the given (deck_num, card_num) pairs ahead of their first activation"""
+        for deck_num, card_num in cards:
+            if COMPILED_CONFIG.is_telltale_deck(deck_num):
+                deck_index = deck_num - 50
+                if deck_index < len(self.telltale_decks):
+                    self.telltale_decks[deck_index].get_card(card_num)
+            elif deck_num < len(self.decks):
+                self.decks[deck_num].get_card(card_num)
+
+    def element(self, deck_num, card_num, element_index):
+        """Return the ui item of a regular deck card element, building the card on first use"""
+        handle = self.element_handles.get((deck_num, card_num, element_index))
+        if handle is None and deck_num < len(self.decks):
+            self.decks[deck_num].get_card(card_num)
+            handle = self.element_handles.get((deck_num, card_num, element_index))
+        return handle
 
     def show_deck(self, deck_num):
         if deck_num < len(self.decks):
@@ -672,49 +1379,54 @@ class MainWindow(QWidget):
         if deck_num < len(self.decks):
             self.decks[deck_num].hide()
 
+    @OPERATIONS.timed("MainWindow.activate_deck_card")
     def activate_deck_card(self, deck_num, card_num):
+        TRACE.emit(CARD_ACTIVATE, deck_num, card_num)
         if deck_num < len(self.decks):
             self.show_deck(deck_num)
             self.decks[deck_num].activate_card(card_num)
 
+    @OPERATIONS.timed("MainWindow.deactivate_deck_card")
     def deactivate_deck_card(self, deck_num, card_num):
+        TRACE.emit(CARD_DEACTIVATE, deck_num, card_num)
         if deck_num < len(self.decks):
             self.decks[deck_num].deactivate_card(card_num)
             # Optionally hide deck if card 0 is empty
             if self.decks[deck_num].active_card == 0:
                 self.hide_deck(deck_num)
 
+    @OPERATIONS.timed("MainWindow.activate_telltale")
     def activate_telltale(self, deck_num, card_num):
         """Activate a telltale deck/card"""
-        if 50 <= deck_num <= max(TELL_TALES.keys()):
+        TRACE.emit(TELLTALE_ACTIVATE, deck_num, card_num)
+        if COMPILED_CONFIG.is_telltale_deck(deck_num):
             deck_index = deck_num - 50
             if deck_index < len(self.telltale_decks):
                 self.telltale_decks[deck_index].activate_card(card_num)
                 # Trigger chime if card_num > 0
                 if card_num > 0:
-                    widget = self.telltale_decks[deck_index].cards[card_num]
+                    widget = self.telltale_decks[deck_index].get_card(card_num)
                     if hasattr(widget, 'trigger_chime'):
                         widget.trigger_chime()
                 # Add to active telltales list if not empty
-                if card_num > 0:
+                telltale = COMPILED_CONFIG.card(deck_num, card_num).telltale
+                if card_num > 0 and telltale is not None:
                     self.active_telltales.append((deck_num, card_num))
                     
                     # Get zone for this telltale
-                    elements = TELL_TALES.get(deck_num, {}).get(card_num, [])
-                    for elem in elements:
-                        if elem["type"] == "image":
-                            zone = elem.get("zone", 1)
-                            if zone not in self.zone_telltales:
-                                self.zone_telltales[zone] = []
-                            if (deck_num, card_num) not in self.zone_telltales[zone]:
-                                self.zone_telltales[zone].append((deck_num, card_num))
-                            break
+                    zone = telltale.zone
+                    if zone not in self.zone_telltales:
+                        self.zone_telltales[zone] = []
+                    if (deck_num, card_num) not in self.zone_telltales[zone]:
+                        self.zone_telltales[zone].append((deck_num, card_num))
                     
-                self.update_zone_display(zone)
+                    self.zone_changed(zone)
 
+    @OPERATIONS.timed("MainWindow.deactivate_telltale")
     def deactivate_telltale(self, deck_num, card_num):
         """Deactivate a telltale deck/card"""
-        if 50 <= deck_num <= max(TELL_TALES.keys()):
+        TRACE.emit(TELLTALE_DEACTIVATE, deck_num, card_num)
+        if COMPILED_CONFIG.is_telltale_deck(deck_num):
             deck_index = deck_num - 50
             if deck_index < len(self.telltale_decks):
                 self.telltale_decks[deck_index].deactivate_card(card_num)
@@ -739,13 +1451,73 @@ class MainWindow(QWidget):
                     
                 # Update all affected zones
                 for zone in affected_zones:
-                    if zone in self.zone_telltales:
-                        self.update_zone_display(zone)
-                    else:
-                        self.stop_zone_round_robin(zone)
+                    self.zone_changed(zone)
 
+    def zone_changed(self, zone):
+        """Re-layout a zone now, or once at the end of the frame commit in progress"""
+        if self.deferred_zones is not None:
+            self.deferred_zones.add(zone)
+        else:
+            self.update_zone_display(zone)
+
+    def queue_activation(self, deck_num, card_num, activation_status):
+        """Record an activation change to be applied with all others on the next frame tick"""
+        self.pending_activations.append((deck_num, card_num, activation_status))
+        if not self.frame_timer.isActive():
+            phase = (time.monotonic() * 1000) % FRAME_INTERVAL_MS
+            self.frame_timer.start(int(FRAME_INTERVAL_MS - phase))
+
+    @OPERATIONS.timed("MainWindow.commit_frame")
+    def commit_frame(self):
+        """Apply the queued activation changes, ending in the same state as applying them one by one:
+        telltales change in order with each zone re-laid out once, and each regular deck is replayed in
+        order and then switched once. All of it lands in a single repaint."""
+        self.frame_timer.stop()
+        pending, self.pending_activations = self.pending_activations, []
+        TRACE.emit(FRAME_COMMIT, len(pending))
+        deck_states = {}  # deck_num: [active card, shown]; shown None while only no-op deactivations came in
+        self.deferred_zones = set()
+        # Runs as a timer slot, where an exception would abort the process: a bad change is logged and skipped
+        try:
+            for deck_num, card_num, activation_status in pending:
+                if COMPILED_CONFIG.is_telltale_deck(deck_num):
+                    try:
+                        if activation_status:
+                            self.activate_telltale(deck_num, card_num)
+                        else:
+                            self.deactivate_telltale(deck_num, card_num)
+                    except Exception as e:
+                        logger.error(f"Queued telltale change {deck_num}/{card_num} failed: {e!r}")
+                elif deck_num < len(self.decks):
+                    state = deck_states.setdefault(deck_num, [self.decks[deck_num].active_card, None])
+                    if activation_status:
+                        state[:] = card_num, True
+                    else:
+                        # Mirrors deactivate_deck_card: the active card falls back to card 0, and card 0 hides the deck
+                        if state[0] == card_num:
+                            state[0] = 0
+                        if state[0] == 0:
+                            state[1] = False
+        finally:
+            zones, self.deferred_zones = self.deferred_zones, None
+        for zone in zones:
+            try:
+                self.update_zone_display(zone)
+            except Exception as e:
+                logger.error(f"Zone {zone} update failed: {e!r}")
+        for deck_num, (card_num, shown) in deck_states.items():
+            try:
+                if shown:
+                    self.activate_deck_card(deck_num, card_num)
+                elif shown is not None:
+                    self.deactivate_deck_card(deck_num, self.decks[deck_num].active_card)
+            except Exception as e:
+                logger.error(f"Queued change of deck {deck_num} to card {card_num} failed: {e!r}")
+
+    @OPERATIONS.timed("MainWindow.update_zone_display")
     def update_zone_display(self, zone):
         """Update display for a specific zone"""
+        TRACE.emit(ZONE_UPDATE, zone, len(self.zone_telltales.get(zone, ())))
         if zone not in self.zone_telltales:
             self.stop_zone_round_robin(zone)
             return
@@ -804,17 +1576,12 @@ class MainWindow(QWidget):
         non_blinking_telltales = []
         
         for deck_num, card_num in telltales:
-            elements = TELL_TALES.get(deck_num, {}).get(card_num, [])
-            for elem in elements:
-                if elem["type"] == "image":
-                    blinking = elem.get("blinking", "NO")
-                    duty_cycle = elem.get("duty_cycle", 0.5)
-                    
-                    if blinking == "YES":
-                        blinking_telltales.append((deck_num, card_num, duty_cycle))
-                    else:
-                        non_blinking_telltales.append((deck_num, card_num))
-                    break
+            telltale = COMPILED_CONFIG.card(deck_num, card_num).telltale
+            if telltale is not None:
+                if telltale.blinking:
+                    blinking_telltales.append((deck_num, card_num, telltale.duty_cycle))
+                else:
+                    non_blinking_telltales.append((deck_num, card_num))
         
         # If all telltales are non-blinking, use standard round-robin
         if not blinking_telltales:
@@ -870,16 +1637,37 @@ class MainWindow(QWidget):
         
         if current_index < len(telltales):
             deck_num, card_num = telltales[current_index]
+            TRACE.emit(ZONE_CYCLE, zone, deck_num, card_num)
             deck_index = deck_num - 50
             if deck_index < len(self.telltale_decks):
                 self.telltale_decks[deck_index].show()
 
 class MessageQueue:
-    def __init__(self, main_window):
+    def __init__(self, main_window, recorder=None):
         self.main_window = main_window
-
+        self.transaction_depth = 0
+        self.recorder = recorder  # scenario_trace.TraceRecorder: every send_* call is appended to a trace
+
+    @contextmanager
+    def transaction(self):
+        """Queue every send_activation made inside the block; they are applied together on the next frame tick"""
+        self.transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self.transaction_depth -= 1
+
+    @OPERATIONS.timed("MessageQueue.send_activation")
     def send_activation(self, deck, card, activation_status):
-        if 50 <= deck <= max(TELL_TALES.keys()):
+        if self.recorder is not None:
+            self.recorder.record("activation", deck, card, activation_status)
+        if self.transaction_depth:
+            self.main_window.queue_activation(deck, card, activation_status)
+            return
+        if self.main_window.pending_activations:
+            # Queued changes come first, or the next frame tick would overwrite this one
+            self.main_window.commit_frame()
+        if COMPILED_CONFIG.is_telltale_deck(deck):
             # Handle telltales
             if activation_status:
                 self.main_window.activate_telltale(deck, card)
@@ -892,47 +1680,66 @@ class MessageQueue:
             else:
                 self.main_window.deactivate_deck_card(deck, card)
 
+    @OPERATIONS.timed("MessageQueue.send_dynamic_text")
     def send_dynamic_text(self, deck, card, text):
         # Update only dynamic text for the given deck/card in the main window
+        if self.recorder is not None:
+            self.recorder.record("dynamic_text", deck, card, text)
         if deck < len(self.main_window.decks):
-            deck_widget = self.main_window.decks[deck]
-            card_widget = deck_widget.cards[card]
-            for idx, elem in enumerate(DECK_GRAPHICS.get(deck, {}).get(card, [])):
-                if elem["type"] == "dynamic_text":
-                    # Find corresponding QLabel in ui_items
-                    label_count = 0
-                    for item in card_widget.ui_items:
-                        if isinstance(item, QLabel):
-                            # Only update the dynamic_text label (by order)
-                            if label_count == idx:
-                                item.setText(text)
-                            label_count += 1
+            for idx in COMPILED_CONFIG.card(deck, card).dynamic_text:
+                item = self.main_window.element(deck, card, idx)
+                if item is not None:
+                    item.setText(text)
 
     def send_progress_bar_old(self, deck, card, value):
         # Update progress bar for the given deck/card in the main window
         if deck < len(self.main_window.decks):
             deck_widget = self.main_window.decks[deck]
-            card_widget = deck_widget.cards[card]
+            card_widget = deck_widget.get_card(card)
             for idx, elem in enumerate(DECK_GRAPHICS.get(deck, {}).get(card, [])):
                 if elem["type"] == "progress_bar":
                     # Find corresponding QProgressBar in ui_items
                     bar_count = 0
                     for item in card_widget.ui_items:
-                        from PyQt5.QtWidgets import QProgressBar
                         if isinstance(item, QProgressBar):
                             if bar_count == idx:
                                 item.setValue(int(value))
                             bar_count += 1
+    @OPERATIONS.timed("MessageQueue.send_progress_bar")
     def send_progress_bar(self, deck, card, value):
         # Update progress bar for the given deck/card in the main window
+        if self.recorder is not None:
+            self.recorder.record("progress_bar", deck, card, value)
         if deck < len(self.main_window.decks):
-            deck_widget = self.main_window.decks[deck]
-            card_widget = deck_widget.cards[card]
-            for item in card_widget.ui_items:
-                from PyQt5.QtWidgets import QProgressBar
-                if isinstance(item, QProgressBar):
+            progress_bars = COMPILED_CONFIG.card(deck, card).progress_bars
+            if progress_bars:
+                item = self.main_window.element(deck, card, progress_bars[0])  # Only update the first progress bar
+                if item is not None:
                     item.setValue(int(value))
-                    break  # Only update the first progress bar
+
+    @OPERATIONS.timed("MessageQueue.send_element")
+    def send_element(self, element_id, value):
+        """Update a dynamic_text or progress_bar element by its stable id (see "id" in DECK_GRAPHICS)"""
+        entry = COMPILED_CONFIG.element_ids.get(element_id)
+        if entry is None:
+            raise KeyError(f"Unknown element id: {element_id}")
+        deck, card, elem = entry
+        if elem.type == "dynamic_text":
+            value = str(value)
+        elif elem.type == "progress_bar":
+            value = int(value)
+        else:
+            raise ValueError(f"Element {element_id} ({elem.type}) cannot be updated")
+        # Only updates that get applied go into the trace, so a replay does not count rejected ones as errors
+        if self.recorder is not None:
+            self.recorder.record("element", 0, 0, value, element_id)
+        item = self.main_window.element(deck, card, elem.index)
+        if item is None:
+            return
+        if elem.type == "dynamic_text":
+            item.setText(value)
+        else:
+            item.setValue(value)
 
 def test_application():
     app = QApplication(sys.argv)